@@ -1,13 +1,32 @@
 """Agents module for thinking hat subagents with search integration."""
 
-from .base_agent import BaseThinkingHatAgent, AgentFactory, AgentProcessingResult
+import os
+
+from langchain_core.globals import set_llm_cache
+
+try:
+    from langchain_community.cache import SQLiteCache
+except ImportError:  # langchain-community is optional; fall back to in-process caching
+    SQLiteCache = None
+    from langchain_core.caches import InMemoryCache
+
+# Cache LLM responses so repeated prompts skip the provider round trip
+if SQLiteCache is not None:
+    set_llm_cache(SQLiteCache(database_path=os.environ.get("SIXHATS_CACHE_DB", ".sixhats_llm_cache.db")))
+else:
+    # Bounded like the hat response cache; evicts the oldest prompts first
+    set_llm_cache(InMemoryCache(maxsize=1024))
+
+from .base_agent import BaseThinkingHatAgent, AgentFactory, AgentPool, AgentProcessingResult
+from .response_cache import HatResponseCache, default_response_cache
 from .thinking_hat_agents import (
     WhiteHatAgent, RedHatAgent, YellowHatAgent, 
     BlackHatAgent, GreenHatAgent, BlueHatAgent
 )
 
 __all__ = [
-    'BaseThinkingHatAgent', 'AgentFactory', 'AgentProcessingResult',
+    'BaseThinkingHatAgent', 'AgentFactory', 'AgentPool', 'AgentProcessingResult',
+    'HatResponseCache', 'default_response_cache',
     'WhiteHatAgent', 'RedHatAgent', 'YellowHatAgent',
     'BlackHatAgent', 'GreenHatAgent', 'BlueHatAgent'
 ]
@@ -3,103 +3,327 @@ Base agent class for thinking hat agents.
 Provides common functionality for search integration and processing.
 """
 
-from typing import Dict, Any, List, Optional
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Any, Callable, FrozenSet, Iterator, List, Mapping, Optional, Sequence, Tuple
 from abc import ABC, abstractmethod
-from datetime import datetime
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime
+import functools
+import hashlib
+import io
+import threading
+import time
 
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 import os
 
+from .response_cache import HatResponseCache, default_response_cache
+
+if TYPE_CHECKING:
+    # Only used in annotations; importing langchain_openai is slow
+    from langchain_openai import ChatOpenAI
+
+
+# Formatted search results keyed by the identity of the results list. The list
+# is held in the entry so its id cannot be reused while cached.
+_SEARCH_RESULTS_TEXT: "OrderedDict[int, Tuple[Any, str]]" = OrderedDict()
+_SEARCH_RESULTS_TEXT_SIZE = 32
+_search_results_text_lock = threading.Lock()
+
+
+def format_search_results(search_results: Sequence[Mapping[str, Any]]) -> str:
+    """
+    Format search results for a system prompt.
+    
+    Hats that share a search receive the same results list, so the text is
+    built once and reused, giving those hats an identical prompt prefix.
+    Results lists are treated as immutable once formatted.
+    """
+    key = id(search_results)
+    with _search_results_text_lock:
+        entry = _SEARCH_RESULTS_TEXT.get(key)
+        if entry is not None and entry[0] is search_results:
+            _SEARCH_RESULTS_TEXT.move_to_end(key)
+            return entry[1]
+    
+    buf = io.StringIO()
+    w = buf.write
+    w("## Search Results Available:")
+    
+    for i, result in enumerate(search_results, 1):
+        title = result.get('title', 'No title')
+        url = result.get('url', 'No URL')
+        content = result.get('content', 'No content')
+        score = result.get('score', 0.0)
+        
+        # One write per result; content is limited to 500 characters
+        w(f"\n\n### Search Result {i} (Score: {score:.2f})"
+          f"\n**Title:** {title}"
+          f"\n**URL:** {url}"
+          f"\n**Content:** {content[:500]}...")
+    
+    text = buf.getvalue()
+    with _search_results_text_lock:
+        _SEARCH_RESULTS_TEXT[key] = (search_results, text)
+        if len(_SEARCH_RESULTS_TEXT) > _SEARCH_RESULTS_TEXT_SIZE:
+            _SEARCH_RESULTS_TEXT.popitem(last=False)
+    return text
+
+
+# LangChain errors can embed whole responses; reports keep only the start
+_ERROR_TEXT_LIMIT = 200
+
+
+def format_error(error: BaseException) -> str:
+    """Short, single-allocation description of an error for results and logs."""
+    return str(error)[:_ERROR_TEXT_LIMIT]
+
+
+def _model_identity(llm: Any) -> str:
+    """Digest of the model and its parameters, serialized as LangChain's LLM cache keys them."""
+    get_llm_string = getattr(llm, '_get_llm_string', None)
+    identity = get_llm_string() if get_llm_string is not None else type(llm).__name__
+    return hashlib.sha256(identity.encode()).hexdigest()[:16]
+
+
+def _today() -> str:
+    """Current local date in ISO format, as shown to the hats."""
+    return date.today().isoformat()
+
+
+@functools.lru_cache(maxsize=32)
+def _static_system_message(system_prompt: str, today: str) -> SystemMessage:
+    """One shared SystemMessage per hat prompt and day; pooled agents of a type reuse it."""
+    return SystemMessage(content=f"{system_prompt}\n\nCurrent date: {today}")
+
 
 class BaseThinkingHatAgent(ABC):
     """Base class for all thinking hat agents."""
     
+    # Agents are created per session; slots drop the per-instance __dict__
+    __slots__ = (
+        'llm', 'agent_name', 'system_prompt', 'response_cache', '_response_cache_name',
+        'has_search_access', 'search_results', 'search_context',
+        '_cached_context_str', '_context_dirty',
+        '_context_version', '_cached_sysmsg', '_cached_sysmsg_key',
+    )
+    
     def __init__(self, llm: ChatOpenAI, agent_name: str, system_prompt: str):
         self.llm = llm
         self.agent_name = agent_name
         self.system_prompt = system_prompt
         
+        # Responses are shared across agent instances; set to None to disable.
+        # Entries are keyed by hat and model, so agents on other models never share them
+        self.response_cache: Optional[HatResponseCache] = default_response_cache
+        self._response_cache_name = f"{agent_name}|{_model_identity(llm)}"
+        
         # Search-related attributes
         self.has_search_access = False
-        self.search_results = []
+        self.search_results: Tuple[Mapping[str, Any], ...] = ()
         self.search_context = {}
+        
+        # Formatted search context is cached until the search state changes
+        self._cached_context_str: Optional[str] = None
+        self._context_dirty = True
+        
+        # System message is reused while (system_prompt, search state) is unchanged
+        self._context_version = 0
+        self._cached_sysmsg: Optional[SystemMessage] = None
+        self._cached_sysmsg_key: Optional[tuple] = None
     
-    def set_search_results(self, search_results: List[Dict[str, Any]], search_context: Dict[str, Any]):
-        """Set search results for the agent to use."""
-        self.search_results = search_results
+    def set_search_results(self, search_results: Sequence[Mapping[str, Any]], search_context: Mapping[str, Any]):
+        """Set search results for the agent to use; empty results leave the state untouched."""
+        if not search_results:
+            return
+        
+        # Stored as a tuple; tuples are kept as-is so hats sharing a search share one object
+        self.search_results = search_results if isinstance(search_results, tuple) else tuple(search_results)
         self.search_context = search_context
         self.has_search_access = True
+        self._context_dirty = True
+        self._context_version += 1
     
     def format_search_context(self) -> str:
         """Format search results into a context string for the LLM."""
+        if not self._context_dirty:
+            return self._cached_context_str # type: ignore
+        
+        self._cached_context_str = self._build_search_context()
+        self._context_dirty = False
+        return self._cached_context_str
+    
+    def _build_search_context(self) -> str:
+        """Build the search context string from the current search state."""
         if not self.has_search_access or not self.search_results:
             return ""
         
-        context_parts = []
-        context_parts.append("## Search Results Available:")
-        
-        for i, result in enumerate(self.search_results, 1):
-            title = result.get('title', 'No title')
-            url = result.get('url', 'No URL')
-            content = result.get('content', 'No content')
-            score = result.get('score', 0.0)
-            
-            context_parts.append(f"\n### Search Result {i} (Score: {score:.2f})")
-            context_parts.append(f"**Title:** {title}")
-            context_parts.append(f"**URL:** {url}")
-            context_parts.append(f"**Content:** {content[:500]}...")  # Limit content length
+        buf = io.StringIO()
+        w = buf.write
+        w(format_search_results(self.search_results))
         
         if self.search_context:
-            context_parts.append(f"\n### Search Metadata:")
+            w("\n\n### Search Metadata:")
             for key, value in self.search_context.items():
-                context_parts.append(f"**{key}:** {value}")
+                w(f"\n**{key}:** {value}")
         
-        return "\n".join(context_parts)
+        return buf.getvalue()
     
     def create_system_message(self) -> SystemMessage:
         """Create the system message for the agent."""
+        # The date is shown at day granularity, so the message is reused all day
+        today = _today()
+        key = (self.system_prompt, self._context_version, today)
+        if self._cached_sysmsg is not None and self._cached_sysmsg_key == key:
+            return self._cached_sysmsg
+        
         search_context = self.format_search_context()
-        full_prompt = self.system_prompt
         
         if search_context:
-            full_prompt += f"\n\n{search_context}\n\nUse the search results above to inform your response. If search results are not relevant, you may ignore them."
-        
-        full_prompt += f"\n\nCurrent timestamp: {datetime.now().isoformat()}"
+            self._cached_sysmsg = SystemMessage(content=(
+                f"{self.system_prompt}\n\n{search_context}\n\nUse the search results above to inform your response. "
+                f"If search results are not relevant, you may ignore them.\n\nCurrent date: {today}"
+            ))
+        else:
+            # Without search context the message is shared by agents with the same prompt
+            self._cached_sysmsg = _static_system_message(self.system_prompt, today)
+        self._cached_sysmsg_key = key
+        return self._cached_sysmsg
+    
+    def invocation_config(self) -> Dict[str, Any]:
+        """Build the per-call LLM config, tagging the run with the agent's name."""
+        return {
+            "metadata": {
+                "agent_name": self.agent_name
+            }
+        }
+    
+    def build_messages(
+        self,
+        user_query: str,
+        conversation_history: Optional[List[BaseMessage]] = None
+    ) -> List[BaseMessage]:
+        """
+        Build the message list for a query, including prior conversation turns.
         
-        return SystemMessage(content=full_prompt)
+        conversation_history is used as-is; process() filters it with
+        _sanitize_history() where it enters.
+        """
+        # One list literal: system message, prior turns, current user query
+        return [
+            self.create_system_message(),
+            *(conversation_history or ()),
+            HumanMessage(content=user_query)
+        ]
+    
+    @classmethod
+    def _sanitize_history(cls, conversation_history: Optional[List]) -> List[BaseMessage]:
+        """Keep only human and AI turns from a raw conversation history."""
+        if not conversation_history:
+            return []
+        return [msg for msg in conversation_history if isinstance(msg, (HumanMessage, AIMessage))]
     
-    def process(self, user_query: str, conversation_history: Optional[List] = None) -> str:
+    def process(self, user_query: str, conversation_history: Optional[List[BaseMessage]] = None) -> str:
         """
         Process a user query and return the agent's response.
         
         Args:
             user_query: The user's query
-            conversation_history: Previous messages in the conversation
+            conversation_history: Previous messages in the conversation; only
+                human and AI turns are sent to the LLM
             
         Returns:
             The agent's response as a string
         """
-        # Build message history
-        messages = [self.create_system_message()]
-        
-        # Add conversation history if provided
-        if conversation_history:
-            for msg in conversation_history:
-                if isinstance(msg, HumanMessage):
-                    messages.append(msg) # type: ignore
-                elif isinstance(msg, AIMessage):
-                    messages.append(msg) # type: ignore
-        
-        # Add current user query
-        messages.append(HumanMessage(content=user_query)) # type: ignore
+        messages = self.build_messages(user_query, self._sanitize_history(conversation_history))
         
         try:
             # Get response from LLM
-            response = self.llm.invoke(messages)
+            response = self.llm.invoke(messages, config=self.invocation_config()) # type: ignore
             return response.content # type: ignore
         except Exception as e:
-            return f"I apologize, but I encountered an error while processing your query: {str(e)}"
+            return self._error_response(e)
+    
+    async def _ainvoke_cached(self, messages: List[BaseMessage], query: str, cache_context: Any = None) -> str:
+        """
+        Invoke the LLM, serving repeated (query, context) pairs from the response cache.
+        
+        cache_context must capture everything besides the query that shapes the
+        prompt. LLM errors propagate and are never cached.
+        """
+        cache = self.response_cache
+        if cache is not None:
+            cached = await cache.aget(self._response_cache_name, query, cache_context)
+            if cached is not None:
+                return cached
+        
+        response = await self.llm.ainvoke(messages, config=self.invocation_config()) # type: ignore
+        content: str = response.content # type: ignore
+        
+        if cache is not None:
+            await cache.aput(self._response_cache_name, query, cache_context, content)
+        return content
+    
+    def _build_call_messages(
+        self,
+        query: str,
+        search_context: Optional[Sequence[Mapping[str, Any]]],
+        extra_system: Optional[str]
+    ) -> List[BaseMessage]:
+        """Set any search results and build the messages for one hat call."""
+        # Each call reflects only its own inputs; agents may be shared across queries
+        if search_context:
+            self.set_search_results(search_context, {})
+        elif self.has_search_access:
+            self.reset_state()
+        
+        if extra_system:
+            return [self.create_system_message(), SystemMessage(content=extra_system), HumanMessage(content=query)]
+        return [self.create_system_message(), HumanMessage(content=query)]
+    
+    async def _invoke(
+        self,
+        query: str,
+        search_context: Optional[Sequence[Mapping[str, Any]]] = None,
+        extra_system: Optional[str] = None
+    ) -> "AgentProcessingResult":
+        """
+        Run one hat call and wrap it in an AgentProcessingResult.
+        
+        Args:
+            query: The user's query
+            search_context: Search results to include in the system prompt
+            extra_system: Per-call context sent as a second system message
+            
+        Returns:
+            AgentProcessingResult; LLM errors are reported in the result
+        """
+        start_time = time.perf_counter()
+        messages = self._build_call_messages(query, search_context, extra_system)
+        
+        error = None
+        try:
+            # The prompt shows the date, so responses are cached per day
+            response = await self._ainvoke_cached(messages, query, (search_context, extra_system, _today()))
+        except Exception as e:
+            error = format_error(e)
+            response = "Error: " + error
+        
+        return AgentProcessingResult(
+            agent_name=self.agent_name,
+            response=response,
+            processing_time=time.perf_counter() - start_time,
+            search_used=bool(search_context),
+            error=error
+        )
+    
+    @staticmethod
+    def _error_response(error: BaseException) -> str:
+        """Response text returned when the LLM call fails."""
+        return "I apologize, but I encountered an error while processing your query: " + format_error(error)
     
     def get_processing_stats(self) -> Dict[str, Any]:
         """Get processing statistics for this agent."""
@@ -113,22 +337,28 @@ class BaseThinkingHatAgent(ABC):
     
     def reset_state(self):
         """Reset the agent's state."""
-        self.search_results = []
+        self.search_results = ()
         self.search_context = {}
         self.has_search_access = False
+        self._context_dirty = True
+        self._context_version += 1
 
 
+@dataclass(slots=True)
 class AgentProcessingResult:
     """Result from agent processing."""
     
-    def __init__(self, agent_name: str, response: str, processing_time: float, 
-                 search_used: bool = False, error: Optional[str] = None):
-        self.agent_name = agent_name
-        self.response = response
-        self.processing_time = processing_time
-        self.search_used = search_used
-        self.error = error
-        self.timestamp = datetime.now()
+    agent_name: str
+    response: str
+    processing_time: float
+    search_used: bool = False
+    error: Optional[str] = None
+    # Epoch seconds; converted to a datetime only when read
+    created_at: float = field(default_factory=time.time)
+    
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at)
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -144,22 +374,95 @@ class AgentProcessingResult:
 class AgentFactory:
     """Factory for creating thinking hat agents."""
     
-    _agents = {}
+    _agents: Dict[str, Callable[..., BaseThinkingHatAgent]] = {}
+    # Registered type names, rebuilt on registration rather than per lookup
+    _agent_types: FrozenSet[str] = frozenset()
     
     @classmethod
     def create_agent(cls, agent_type: str, llm: ChatOpenAI, **kwargs) -> BaseThinkingHatAgent:
         """Create an agent of the specified type."""
-        if agent_type not in cls._agents:
+        if agent_type not in cls._agent_types:
             raise ValueError(f"Unknown agent type: {agent_type}")
         
-        return cls._agents[agent_type](llm, **kwargs)
+        # The hat agents only take the LLM; skip kwargs packing in that case
+        if kwargs:
+            return cls._agents[agent_type](llm, **kwargs)
+        return cls._agents[agent_type](llm)
     
     @classmethod
     def register_agent(cls, agent_type: str, agent_class):
         """Register an agent class."""
         cls._agents[agent_type] = agent_class
+        cls._agent_types = frozenset(cls._agents)
     
     @classmethod
     def get_available_agents(cls) -> List[str]:
         """Get list of available agent types."""
         return list(cls._agents.keys())
+
+
+class AgentPool:
+    """
+    Idle hat agents for one LLM, reused across queries.
+    
+    Owned by whoever owns the LLM (a workflow graph), so pooled agents and
+    the LLM they hold are released together.
+    """
+    
+    def __init__(self, llm: ChatOpenAI):
+        self.llm = llm
+        self._pools: Dict[str, "deque[BaseThinkingHatAgent]"] = {}
+        self._lock = threading.Lock()
+    
+    def _pool_for(self, agent_type: str) -> "deque[BaseThinkingHatAgent]":
+        pool = self._pools.get(agent_type)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.setdefault(agent_type, deque())
+        return pool
+    
+    def acquire(self, agent_type: str) -> BaseThinkingHatAgent:
+        """
+        Take an idle agent of the specified type, or create one.
+        
+        An acquired agent is used by one caller at a time, so concurrent
+        queries never share per-call search state. Return it with release().
+        """
+        pool = self._pools.get(agent_type)
+        while pool:
+            try:
+                # Round-robin: take the longest-idle agent
+                agent = pool.popleft()
+            except IndexError:
+                break  # Drained by another thread
+            # Skip agents built from a class that has since been re-registered
+            if type(agent) is AgentFactory._agents.get(agent_type):
+                return agent
+        return AgentFactory.create_agent(agent_type, self.llm)
+    
+    def release(self, agent_type: str, agent: BaseThinkingHatAgent):
+        """Reset an acquired agent and return it to the pool."""
+        agent.reset_state()
+        self._pool_for(agent_type).append(agent)
+    
+    def fill(self, size: int):
+        """Pre-create idle agents of every type so up to `size` concurrent queries never build one."""
+        for agent_type in AgentFactory.get_available_agents():
+            pool = self._pool_for(agent_type)
+            for _ in range(size - len(pool)):
+                pool.append(AgentFactory.create_agent(agent_type, self.llm))
+    
+    @contextmanager
+    def leased(self, agent_type: str) -> Iterator[BaseThinkingHatAgent]:
+        """Acquire an agent for the duration of a with block."""
+        agent = self.acquire(agent_type)
+        try:
+            yield agent
+        finally:
+            self.release(agent_type, agent)
+    
+    def clear(self):
+        """Drop idle agents."""
+        with self._lock:
+            self._pools.clear()
+
@@ -11,11 +11,19 @@ This agent analyzes user queries before processing begins and determines:
 This is the first phase of the phased sequential architecture.
 """
 
-from enum import Enum
-from typing import Dict, List, Optional, Literal
+from enum import Enum, IntEnum
+from typing import Dict, List, Optional, Literal, Tuple
+import dataclasses
 from dataclasses import dataclass
 from langchain_core.language_models import BaseLanguageModel
+import functools
 import re
+from collections import Counter
+
+try:
+    import ahocorasick
+except ImportError:  # Optional accelerator; regex patterns are used instead
+    ahocorasick = None
 
 
 class Complexity(Enum):
@@ -36,36 +44,199 @@ class Topic(Enum):
     SAFETY = "safety"
 
 
-class HatType(Enum):
-    """Thinking hat types"""
-    WHITE = "white"
-    RED = "red"
-    YELLOW = "yellow"
-    BLACK = "black"
-    GREEN = "green"
-    BLUE = "blue"
-
-
-class SearchPriority(Enum):
-    """Search priority levels"""
-    CRITICAL = "critical"  # Must search
-    HIGH = "high"          # Should search
-    MEDIUM = "medium"      # May search if budget allows
-    LOW = "low"            # Rarely searches
-    NEVER = "never"        # Never searches
-
-
-@dataclass
+# Precompiled complexity indicators, searched in the lowercased query. The
+# uppercase AI/ML alternatives of the original pattern could never match it,
+# so they are left out rather than changing which queries count as technical.
+_TECHNICAL_RE = re.compile(r'\b(algorithm|quantum|crypto|blockchain|neural|bioinformatics|pharmacology)\b')
+_COMPARATIVE_RE = re.compile(r'\b(compare|versus|difference|trade-off|pros/cons|advantage|disadvantage)\b')
+
+# Keywords used to classify the topic domain of a query
+_TOPIC_KEYWORDS = {
+    Topic.BUSINESS: [
+        'business', 'company', 'startup', 'entrepreneur', 'revenue', 'profit',
+        'market', 'competition', 'strategy', 'investment', 'funding', 'IPO',
+        'merger', 'acquisition', 'venture', 'ROI', 'sales', 'customer'
+    ],
+    Topic.HEALTH: [
+        'health', 'medical', 'disease', 'treatment', 'therapy', 'doctor',
+        'hospital', 'medicine', 'drug', 'symptom', 'diagnosis', 'healthcare',
+        'wellness', 'nutrition', 'exercise', 'fitness', 'mental health'
+    ],
+    Topic.TECHNOLOGY: [
+        'technology', 'software', 'programming', 'AI', 'machine learning',
+        'data', 'algorithm', 'tech', 'digital', 'computer', 'internet',
+        'cloud', 'cybersecurity', 'blockchain', 'quantum', 'robotics'
+    ],
+    Topic.EMOTIONAL: [
+        'feel', 'emotion', 'feeling', 'sad', 'happy', 'angry', 'anxious',
+        'relationship', 'love', 'family', 'friendship', 'personal',
+        'mood', 'psychology', 'mental', 'self-esteem', 'confidence'
+    ],
+    Topic.SOCIAL: [
+        'society', 'social', 'community', 'culture', 'political',
+        'government', 'policy', 'law', 'ethics', 'justice', 'equality',
+        'diversity', 'public', 'social media', 'news', 'controversy'
+    ],
+    Topic.SAFETY: [
+        'safety', 'risk', 'danger', 'hazard', 'security', 'threat',
+        'vulnerability', 'accident', 'injury', 'harm', 'warning',
+        'liability', 'insurance', 'precaution'
+    ]
+}
+
+
+# Keyword -> topics it counts towards. Keywords are matched in the lowercased
+# query, so the uppercase ones (IPO, ROI, AI) never match and are skipped, as
+# in the original classifier.
+_KEYWORD_TOPICS: Dict[str, tuple] = {}
+for _topic, _keywords in _TOPIC_KEYWORDS.items():
+    for _keyword in _keywords:
+        if _keyword.islower():
+            _KEYWORD_TOPICS[_keyword] = _KEYWORD_TOPICS.get(_keyword, ()) + (_topic,)
+del _topic, _keywords, _keyword
+
+# Keywords match anywhere in the query, overlaps included, so inflections
+# ("risks") and compounds ("fintech") count, and "mental health" counts
+# "mental" and "health" as well
+_TOPIC_SUBSTRINGS = tuple(_KEYWORD_TOPICS)
+
+
+def _build_topic_automaton():
+    """Build an Aho-Corasick automaton over all topic keywords, if available."""
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for keyword in _TOPIC_SUBSTRINGS:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+# Single-pass multi-pattern matcher for _TOPIC_SUBSTRINGS; None falls back to
+# one substring check per keyword
+_TOPIC_AUTOMATON = _build_topic_automaton()
+
+
+class HatType(IntEnum):
+    """Thinking hat types (values double as indexes into per-hat lists)"""
+    WHITE = 0
+    RED = 1
+    YELLOW = 2
+    BLACK = 3
+    GREEN = 4
+    BLUE = 5
+
+    @property
+    def key(self) -> str:
+        """String key used for this hat in workflow state ("white", "red", ...)"""
+        return _HAT_KEYS[self]
+
+
+class SearchPriority(IntEnum):
+    """Search priority levels (lower values rank first)"""
+    CRITICAL = 0  # Must search
+    HIGH = 1      # Should search
+    MEDIUM = 2    # May search if budget allows
+    LOW = 3       # Rarely searches
+    NEVER = 4     # Never searches
+
+    @property
+    def label(self) -> str:
+        """Lowercase display label ("critical", "high", ...)"""
+        return _PRIORITY_LABELS[self]
+
+
+_HAT_KEYS = [hat.name.lower() for hat in HatType]
+_PRIORITY_LABELS = [priority.name.lower() for priority in SearchPriority]
+
+
+@dataclass(frozen=True, slots=True)
 class QueryAnalysis:
-    """Result of query analysis"""
+    """Result of query analysis (immutable and hashable, so usable as a cache key)"""
     query: str
     complexity: Complexity
     topic: Topic
-    search_recommendations: Dict[HatType, SearchPriority]
-    search_queries: Dict[HatType, str]
-    budget_allocation: List[HatType]
+    search_recommendations: Tuple[SearchPriority, ...]  # Indexed by HatType
+    search_queries: Tuple[Tuple[HatType, str], ...]  # (hat, query) pairs in HatType order
+    budget_allocation: Tuple[HatType, ...]
     rationale: str
 
+    def search_queries_as_dict(self) -> Dict[HatType, str]:
+        """Search queries keyed by hat."""
+        return dict(self.search_queries)
+
+
+# Priorities that qualify a hat for the search budget
+_ALLOCATABLE_PRIORITIES = frozenset({SearchPriority.CRITICAL, SearchPriority.HIGH, SearchPriority.MEDIUM})
+
+# Display names used in the allocation rationale, indexed by HatType
+_HAT_NAMES = [
+    "White (Facts)",
+    "Red (Emotions)",
+    "Yellow (Benefits)",
+    "Black (Risks)",
+    "Green (Creativity)",
+    "Blue (Synthesis)"
+]
+
+# Words that raise a hat's search priority when present in the query
+_RED_TRIGGER_WORDS = frozenset({'feel', 'emotion', 'reaction', 'response', 'sentiment'})
+_YELLOW_TRIGGER_WORDS = frozenset({'benefit', 'advantage', 'opportunity', 'success', 'positive'})
+_BLACK_TRIGGER_WORDS = frozenset({'risk', 'problem', 'failure', 'danger', 'criticism'})
+_GREEN_TRIGGER_WORDS = frozenset({'creative', 'innovation', 'alternative', 'solution', 'breakthrough'})
+
+
+def _compile_substring_pattern(words) -> re.Pattern:
+    """Compile words into one alternation matching anywhere in a lowercased query."""
+    return re.compile('|'.join(map(re.escape, sorted(words))))
+
+
+# One scan per hat instead of a Python-level substring check per word. Substring
+# semantics are kept so inflections ("risks", "feelings") still trigger.
+_RED_TRIGGER_RE = _compile_substring_pattern(_RED_TRIGGER_WORDS)
+_YELLOW_TRIGGER_RE = _compile_substring_pattern(_YELLOW_TRIGGER_WORDS)
+_BLACK_TRIGGER_RE = _compile_substring_pattern(_BLACK_TRIGGER_WORDS)
+_GREEN_TRIGGER_RE = _compile_substring_pattern(_GREEN_TRIGGER_WORDS)
+
+# Any of these substrings can move a query off the default analysis. The set is a
+# superset of every keyword check above, so a miss guarantees the default result.
+_SIGNAL_RE = re.compile(
+    '|'.join(map(re.escape, sorted(
+        set(_KEYWORD_TOPICS)
+        | _RED_TRIGGER_WORDS | _YELLOW_TRIGGER_WORDS | _BLACK_TRIGGER_WORDS | _GREEN_TRIGGER_WORDS
+        | {'algorithm', 'quantum', 'crypto', 'blockchain', 'neural', 'bioinformatics',
+           'pharmacology', 'compare', 'versus', 'difference', 'trade-off', 'advantage'},
+        key=len, reverse=True
+    ))),
+    re.IGNORECASE
+)
+
+# Characters that mark a query as more than a short literal lookup
+_NON_TRIVIAL_CHARS = frozenset('?,&/')
+
+# Topic-specific search terms appended to hat search queries
+_EMOTION_TERMS = {
+    Topic.EMOTIONAL: "reactions opinions feelings response",
+    Topic.SOCIAL: "public opinion social response reactions",
+    Topic.HEALTH: "patient experiences emotional impact",
+    Topic.BUSINESS: "customer reviews business sentiment",
+    Topic.TECHNOLOGY: "user experience community feedback"
+}
+_YELLOW_TERMS = {
+    Topic.BUSINESS: "business benefits advantages opportunities success case studies",
+    Topic.HEALTH: "health benefits positive outcomes improvements",
+    Topic.TECHNOLOGY: "innovation benefits technological advantages improvements",
+    Topic.GENERAL: "benefits advantages opportunities positive aspects"
+}
+_BLACK_TERMS = {
+    Topic.HEALTH: "health risks side effects dangers problems",
+    Topic.SAFETY: "safety risks hazards dangers warnings",
+    Topic.BUSINESS: "business risks challenges problems failures",
+    Topic.TECHNOLOGY: "technology risks cybersecurity threats problems",
+    Topic.GENERAL: "risks problems challenges limitations"
+}
+
 
 class ManagerAgent:
     """
@@ -76,27 +247,57 @@ class ManagerAgent:
     - Determining search priorities for each hat
     - Allocating the 4-search budget intelligently
     - Generating hat-specific search queries
+
+    The analysis is rule-based and deterministic for a given query string,
+    so results are memoized per instance. The LLM is kept for API
+    compatibility but is not called during analysis.
     """
 
-    def __init__(self, llm: BaseLanguageModel):
+    def __init__(self, llm: BaseLanguageModel, analysis_cache_size: int = 1024):
         self.llm = llm
+        self._analyze_query_cached = functools.lru_cache(maxsize=analysis_cache_size)(
+            self._analyze_query_uncached
+        )
 
     def analyze_query(self, query: str) -> QueryAnalysis:
         """
         Analyze a user query to determine complexity, topic, and search strategy.
 
+        Repeated queries (retries, re-runs) are served from an LRU cache,
+        keyed on the query with whitespace collapsed so copies that differ
+        only in spacing or a trailing newline share one entry.
+
         Args:
             query: The user's question or query
 
         Returns:
             QueryAnalysis with all necessary information for search orchestration
         """
+        return self._analyze_query_cached(_normalize_query(query))
+
+    def clear_analysis_cache(self):
+        """Clear memoized query analyses."""
+        self._analyze_query_cached.cache_clear()
+
+    def _analyze_query_uncached(self, query: str) -> QueryAnalysis:
+        """Analyze a query, short-circuiting trivial lookups."""
+        # Short literal lookups always produce the default analysis
+        if _is_trivial_query(query):
+            return _default_analysis_for(query)
+
+        return self._run_analysis_pipeline(query)
+
+    def _run_analysis_pipeline(self, query: str) -> QueryAnalysis:
+        """Classify the query and derive its search strategy."""
+        # Lowercase once and share with the helpers
+        query_lower = query.lower()
+
         # Analyze query characteristics
-        complexity = self._determine_complexity(query)
-        topic = self._classify_topic(query)
+        complexity = self._determine_complexity(query, query_lower)
+        topic = self._classify_topic(query_lower)
 
         # Determine search priorities
-        search_recommendations = self._determine_search_priorities(query, complexity, topic)
+        search_recommendations = self._determine_search_priorities(query_lower, complexity, topic)
 
         # Allocate search budget (max 4 searches)
         budget_allocation = self._allocate_search_budget(search_recommendations)
@@ -111,13 +312,13 @@ class ManagerAgent:
             query=query,
             complexity=complexity,
             topic=topic,
-            search_recommendations=search_recommendations,
-            search_queries=search_queries,
-            budget_allocation=budget_allocation,
+            search_recommendations=tuple(search_recommendations),
+            search_queries=tuple(sorted(search_queries.items())),
+            budget_allocation=tuple(budget_allocation),
             rationale=rationale
         )
 
-    def _determine_complexity(self, query: str) -> Complexity:
+    def _determine_complexity(self, query: str, query_lower: str) -> Complexity:
         """
         Determine query complexity based on:
         - Number of concepts/keywords
@@ -127,9 +328,9 @@ class ManagerAgent:
         """
         # Count key indicators
         word_count = len(query.split())
-        has_technical_terms = bool(re.search(r'\b(algorithm|quantum|crypto|blockchain|AI|ML|neural|bioinformatics|pharmacology)\b', query.lower()))
+        has_technical_terms = _TECHNICAL_RE.search(query_lower) is not None
         has_multiple_parts = query.count('?') > 1 or query.count(' and ') > 0 or query.count(',') > 2
-        has_comparative_terms = bool(re.search(r'\b(compare|versus|difference|trade-off|pros/cons|advantage|disadvantage)\b', query.lower()))
+        has_comparative_terms = _COMPARATIVE_RE.search(query_lower) is not None
 
         # Scoring system
         complexity_score = 0
@@ -150,52 +351,19 @@ class ManagerAgent:
         else:
             return Complexity.COMPLEX
 
-    def _classify_topic(self, query: str) -> Topic:
+    def _classify_topic(self, query_lower: str) -> Topic:
         """Classify query into topic domain using keyword matching"""
 
-        topic_keywords = {
-            Topic.BUSINESS: [
-                'business', 'company', 'startup', 'entrepreneur', 'revenue', 'profit',
-                'market', 'competition', 'strategy', 'investment', 'funding', 'IPO',
-                'merger', 'acquisition', 'venture', 'ROI', 'sales', 'customer'
-            ],
-            Topic.HEALTH: [
-                'health', 'medical', 'disease', 'treatment', 'therapy', 'doctor',
-                'hospital', 'medicine', 'drug', 'symptom', 'diagnosis', 'healthcare',
-                'wellness', 'nutrition', 'exercise', 'fitness', 'mental health'
-            ],
-            Topic.TECHNOLOGY: [
-                'technology', 'software', 'programming', 'AI', 'machine learning',
-                'data', 'algorithm', 'tech', 'digital', 'computer', 'internet',
-                'cloud', 'cybersecurity', 'blockchain', 'quantum', 'robotics'
-            ],
-            Topic.EMOTIONAL: [
-                'feel', 'emotion', 'feeling', 'sad', 'happy', 'angry', 'anxious',
-                'relationship', 'love', 'family', 'friendship', 'personal',
-                'mood', 'psychology', 'mental', 'self-esteem', 'confidence'
-            ],
-            Topic.SOCIAL: [
-                'society', 'social', 'community', 'culture', 'political',
-                'government', 'policy', 'law', 'ethics', 'justice', 'equality',
-                'diversity', 'public', 'social media', 'news', 'controversy'
-            ],
-            Topic.SAFETY: [
-                'safety', 'risk', 'danger', 'hazard', 'security', 'threat',
-                'vulnerability', 'accident', 'injury', 'harm', 'warning',
-                'liability', 'insurance', 'precaution'
-            ]
-        }
-
-        query_lower = query.lower()
+        # Score each topic by the number of distinct keywords present
+        if _TOPIC_AUTOMATON is not None:
+            matched = {keyword for _, keyword in _TOPIC_AUTOMATON.iter(query_lower)}
+        else:
+            matched = {keyword for keyword in _TOPIC_SUBSTRINGS if keyword in query_lower}
 
-        # Score each topic
-        topic_scores = {}
-        for topic, keywords in topic_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in query_lower)
-            if score > 0:
-                topic_scores[topic] = score
+        counts = Counter(topic for keyword in matched for topic in _KEYWORD_TOPICS[keyword])
 
-        # Return topic with highest score
+        # Return topic with highest score; ties resolve in keyword table order
+        topic_scores = {topic: counts[topic] for topic in _TOPIC_KEYWORDS if counts[topic]}
         if topic_scores:
             return max(topic_scores, key=topic_scores.get) # type: ignore
         else:
@@ -203,47 +371,47 @@ class ManagerAgent:
 
     def _determine_search_priorities(
         self,
-        query: str,
+        query_lower: str,
         complexity: Complexity,
         topic: Topic
-    ) -> Dict[HatType, SearchPriority]:
+    ) -> List[SearchPriority]:
         """
         Determine which hats should search based on query characteristics.
-        Returns priorities for all 6 hats.
+        Returns priorities for all 6 hats, indexed by HatType.
         """
 
-        priorities = {}
+        priorities = [SearchPriority.NEVER] * len(HatType)
 
         # White Hat: Always searches for facts and data
         priorities[HatType.WHITE] = SearchPriority.CRITICAL
 
         # Red Hat: Searches on emotional/social topics
-        if topic in [Topic.EMOTIONAL, Topic.SOCIAL] or any(
-            word in query.lower() for word in ['feel', 'emotion', 'reaction', 'response', 'sentiment']
+        if topic in [Topic.EMOTIONAL, Topic.SOCIAL] or (
+            _RED_TRIGGER_RE.search(query_lower) is not None
         ):
             priorities[HatType.RED] = SearchPriority.HIGH
         else:
             priorities[HatType.RED] = SearchPriority.MEDIUM
 
         # Yellow Hat: Searches on business/opportunity topics
-        if topic == Topic.BUSINESS or complexity == Complexity.COMPLEX or any(
-            word in query.lower() for word in ['benefit', 'advantage', 'opportunity', 'success', 'positive']
+        if topic == Topic.BUSINESS or complexity == Complexity.COMPLEX or (
+            _YELLOW_TRIGGER_RE.search(query_lower) is not None
         ):
             priorities[HatType.YELLOW] = SearchPriority.HIGH
         else:
             priorities[HatType.YELLOW] = SearchPriority.MEDIUM
 
         # Black Hat: Searches on risk/health/safety topics
-        if topic in [Topic.HEALTH, Topic.SAFETY] or any(
-            word in query.lower() for word in ['risk', 'problem', 'failure', 'danger', 'criticism']
+        if topic in [Topic.HEALTH, Topic.SAFETY] or (
+            _BLACK_TRIGGER_RE.search(query_lower) is not None
         ):
             priorities[HatType.BLACK] = SearchPriority.HIGH
         else:
             priorities[HatType.BLACK] = SearchPriority.MEDIUM
 
         # Green Hat: Searches for complex, innovative solutions
-        if complexity == Complexity.COMPLEX or any(
-            word in query.lower() for word in ['creative', 'innovation', 'alternative', 'solution', 'breakthrough']
+        if complexity == Complexity.COMPLEX or (
+            _GREEN_TRIGGER_RE.search(query_lower) is not None
         ):
             priorities[HatType.GREEN] = SearchPriority.MEDIUM
         else:
@@ -256,49 +424,25 @@ class ManagerAgent:
 
     def _allocate_search_budget(
         self,
-        search_recommendations: Dict[HatType, SearchPriority]
+        search_recommendations: List[SearchPriority]
     ) -> List[HatType]:
         """
         Allocate the 4-search budget based on priorities.
         Returns list of hats that will search, in priority order.
         """
 
-        # Define allocation strategy based on priority
-        def should_allocate(priority: SearchPriority) -> bool:
-            if priority == SearchPriority.CRITICAL:
-                return True
-            elif priority == SearchPriority.HIGH:
-                return True
-            elif priority == SearchPriority.MEDIUM:
-                return True
-            else:
-                return False
-
-        # Get hats that should search, sorted by priority
+        # Priorities and hats are both ints, so the tuples sort natively;
+        # ties keep HatType order
         candidates = [
-            (hat, priority) for hat, priority in search_recommendations.items()
-            if should_allocate(priority)
+            (priority, HatType(hat))
+            for hat, priority in enumerate(search_recommendations)
+            if priority in _ALLOCATABLE_PRIORITIES
         ]
+        candidates.sort()
 
-        # Sort by priority (CRITICAL > HIGH > MEDIUM > LOW > NEVER)
-        priority_order = {
-            SearchPriority.CRITICAL: 0,
-            SearchPriority.HIGH: 1,
-            SearchPriority.MEDIUM: 2,
-            SearchPriority.LOW: 3,
-            SearchPriority.NEVER: 4
-        }
-
-        candidates.sort(key=lambda x: priority_order[x[1]])
-
-        # Allocate up to 4 searches
-        allocated = [hat for hat, _ in candidates[:4]]
-
-        # Ensure White Hat is always included
-        if HatType.WHITE not in allocated and HatType.WHITE in search_recommendations:
-            # If White Hat not in top 4, replace the lowest priority
-            allocated.pop()
-            allocated.insert(0, HatType.WHITE)
+        # Allocate up to 4 searches. White Hat is always CRITICAL, so it is
+        # always at the front of the allocation.
+        allocated = [hat for _, hat in candidates[:4]]
 
         return allocated
 
@@ -321,37 +465,17 @@ class ManagerAgent:
 
             elif hat_type == HatType.RED:
                 # Red Hat: Emotions and reactions
-                emotion_terms = {
-                    Topic.EMOTIONAL: "reactions opinions feelings response",
-                    Topic.SOCIAL: "public opinion social response reactions",
-                    Topic.HEALTH: "patient experiences emotional impact",
-                    Topic.BUSINESS: "customer reviews business sentiment",
-                    Topic.TECHNOLOGY: "user experience community feedback"
-                }
-                search_terms = emotion_terms.get(topic, "opinion reaction sentiment response")
+                search_terms = _EMOTION_TERMS.get(topic, "opinion reaction sentiment response")
                 search_queries[hat_type] = f"{query} {search_terms}"
 
             elif hat_type == HatType.YELLOW:
                 # Yellow Hat: Benefits and opportunities
-                yellow_terms = {
-                    Topic.BUSINESS: "business benefits advantages opportunities success case studies",
-                    Topic.HEALTH: "health benefits positive outcomes improvements",
-                    Topic.TECHNOLOGY: "innovation benefits technological advantages improvements",
-                    Topic.GENERAL: "benefits advantages opportunities positive aspects"
-                }
-                search_terms = yellow_terms.get(topic, "benefits advantages opportunities")
+                search_terms = _YELLOW_TERMS.get(topic, "benefits advantages opportunities")
                 search_queries[hat_type] = f"{query} {search_terms}"
 
             elif hat_type == HatType.BLACK:
                 # Black Hat: Risks and problems
-                black_terms = {
-                    Topic.HEALTH: "health risks side effects dangers problems",
-                    Topic.SAFETY: "safety risks hazards dangers warnings",
-                    Topic.BUSINESS: "business risks challenges problems failures",
-                    Topic.TECHNOLOGY: "technology risks cybersecurity threats problems",
-                    Topic.GENERAL: "risks problems challenges limitations"
-                }
-                search_terms = black_terms.get(topic, "risks problems challenges")
+                search_terms = _BLACK_TERMS.get(topic, "risks problems challenges")
                 search_queries[hat_type] = f"{query} {search_terms}"
 
             elif hat_type == HatType.GREEN:
@@ -369,27 +493,50 @@ class ManagerAgent:
         complexity: Complexity,
         topic: Topic,
         budget_allocation: List[HatType],
-        search_recommendations: Dict[HatType, SearchPriority]
+        search_recommendations: List[SearchPriority]
     ) -> str:
         """Build a human-readable rationale for the search allocation decision"""
 
-        rationale = f"Query classified as {complexity.value} complexity, {topic.value} topic. "
+        allocations = ", ".join(
+            f"{_HAT_NAMES[hat]} ({search_recommendations[hat].label})"
+            for hat in budget_allocation
+        )
 
-        rationale += f"Search budget allocated to {len(budget_allocation)} hats: "
+        rationale = (
+            f"Query classified as {complexity.value} complexity, {topic.value} topic. "
+            f"Search budget allocated to {len(budget_allocation)} hats: {allocations}."
+        )
 
-        hat_names = {
-            HatType.WHITE: "White (Facts)",
-            HatType.RED: "Red (Emotions)",
-            HatType.YELLOW: "Yellow (Benefits)",
-            HatType.BLACK: "Black (Risks)",
-            HatType.GREEN: "Green (Creativity)",
-            HatType.BLUE: "Blue (Synthesis)"
-        }
+        return rationale
 
-        for hat in budget_allocation:
-            priority = search_recommendations[hat]
-            rationale += f"{hat_names[hat]} ({priority.value}), "
 
-        rationale = rationale.rstrip(", ") + "."
+def _normalize_query(query: str) -> str:
+    """Collapse runs of whitespace so spacing variants of a query share an analysis."""
+    return ' '.join(query.split())
 
-        return rationale
+
+def _is_trivial_query(query: str) -> bool:
+    """True for short queries with no punctuation or keyword that affects analysis."""
+    return (
+        len(query) < 30 and
+        query.count(' ') <= 3 and
+        _NON_TRIVIAL_CHARS.isdisjoint(query) and
+        _SIGNAL_RE.search(query) is None
+    )
+
+
+# Template for trivial queries: the full pipeline's result for a query with no
+# signals (simple complexity, general topic, default four-hat allocation)
+_DEFAULT_ANALYSIS = ManagerAgent(None)._run_analysis_pipeline("") # type: ignore
+_DEFAULT_SEARCH_TERMS = {
+    hat: search_query.strip() for hat, search_query in _DEFAULT_ANALYSIS.search_queries
+}
+
+
+def _default_analysis_for(query: str) -> QueryAnalysis:
+    """Clone the default analysis for a trivial query."""
+    return dataclasses.replace(
+        _DEFAULT_ANALYSIS,
+        query=query,
+        search_queries=tuple((hat, f"{query} {terms}") for hat, terms in _DEFAULT_SEARCH_TERMS.items())
+    )
@@ -0,0 +1,184 @@
+"""
+Response cache for thinking hat agents.
+
+Two tiers:
+1. Exact match - LRU keyed on (agent name, query, context)
+2. Semantic match (optional) - cosine similarity of query embeddings, only
+   against entries from the same agent with the same context, so a follow-up
+   question is never answered from a different conversation state
+
+Embeddings are stored unit-normalized, so similarity is a dot product. With
+numpy installed each bucket is scored as one matrix-vector product.
+"""
+
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+try:
+    import numpy as np
+except ImportError:  # Optional accelerator; similarities are computed in pure Python instead
+    np = None
+
+
+class HatResponseCache:
+    """LRU cache of hat responses with an optional embedding-similarity fallback."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        embeddings: Optional[Embeddings] = None,
+        similarity_threshold: float = 0.92
+    ):
+        self.max_entries = max_entries
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+
+        # key -> (response, semantic bucket, query embedding)
+        self._exact: OrderedDict[str, Tuple[str, Tuple[str, str], Optional[List[float]]]] = OrderedDict()
+        # (agent name, context digest) -> keys of entries with an embedding
+        self._semantic: Dict[Tuple[str, str], List[str]] = {}
+        # Stacked embeddings per bucket for numpy scoring, rebuilt after changes
+        self._matrices: Dict[Tuple[str, str], Any] = {}
+        # Last embedded query, so a miss followed by put() embeds once
+        self._last_embedding: Tuple[Optional[str], Optional[List[float]]] = (None, None)
+        self._lock = threading.Lock()
+
+        self.stats = {'exact_hits': 0, 'semantic_hits': 0, 'misses': 0}
+
+    @staticmethod
+    def _context_digest(context: Any) -> str:
+        """Stable digest of the context a response was generated from."""
+        payload = json.dumps(context, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def _make_key(agent_name: str, query: str, context_digest: str) -> str:
+        return hashlib.sha256(f"{agent_name}|{query}|{context_digest}".encode()).hexdigest()
+
+    async def _embed(self, query: str) -> Optional[List[float]]:
+        """
+        Embed a query for the semantic tier, reusing the previous embedding.
+
+        All hats see the same query in a turn, so it is embedded once per turn.
+        """
+        if self.embeddings is None:
+            return None
+
+        last_query, last_embedding = self._last_embedding
+        if last_query == query:
+            return last_embedding
+
+        embedding = self._normalize(await self.embeddings.aembed_query(query))
+        self._last_embedding = (query, embedding)
+        return embedding
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> List[float]:
+        norm = math.sqrt(sum(x * x for x in embedding))
+        return [x / norm for x in embedding] if norm else embedding
+
+    def _best_match(self, bucket: Tuple[str, str], embedding: List[float]) -> Tuple[Optional[str], float]:
+        """Most similar entry in a bucket and its cosine similarity. Call with the lock held."""
+        keys = self._semantic.get(bucket)
+        if not keys:
+            return None, 0.0
+
+        if np is not None:
+            matrix = self._matrices.get(bucket)
+            if matrix is None:
+                matrix = self._matrices[bucket] = np.array([self._exact[key][2] for key in keys])
+            scores = matrix @ np.asarray(embedding)
+            best = int(scores.argmax())
+            return keys[best], float(scores[best])
+
+        best_key, best_score = None, 0.0
+        for key in keys:
+            score = sum(x * y for x, y in zip(embedding, self._exact[key][2])) # type: ignore
+            if best_key is None or score > best_score:
+                best_key, best_score = key, score
+        return best_key, best_score
+
+    async def aget(self, agent_name: str, query: str, context: Any = None) -> Optional[str]:
+        """Return a cached response for this agent, query and context, if any."""
+        digest = self._context_digest(context)
+        key = self._make_key(agent_name, query, digest)
+
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is not None:
+                self._exact.move_to_end(key)
+                self.stats['exact_hits'] += 1
+                return entry[0]
+
+            has_candidates = bool(self._semantic.get((agent_name, digest)))
+
+        if has_candidates:
+            embedding = await self._embed(query)
+            if embedding is not None:
+                with self._lock:
+                    best_key, best_score = self._best_match((agent_name, digest), embedding)
+                    if best_key is not None and best_score >= self.similarity_threshold:
+                        self._exact.move_to_end(best_key)
+                        self.stats['semantic_hits'] += 1
+                        return self._exact[best_key][0]
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    async def aput(self, agent_name: str, query: str, context: Any, response: str):
+        """Store a response for this agent, query and context."""
+        digest = self._context_digest(context)
+        key = self._make_key(agent_name, query, digest)
+        bucket = (agent_name, digest)
+        embedding = await self._embed(query)
+
+        with self._lock:
+            if key in self._exact:
+                self._exact.move_to_end(key)
+                self._exact[key] = (response, bucket, self._exact[key][2])
+                return
+
+            self._exact[key] = (response, bucket, embedding)
+            if embedding is not None:
+                self._semantic.setdefault(bucket, []).append(key)
+                self._matrices.pop(bucket, None)
+
+            # Evict least recently used entries from both tiers
+            while len(self._exact) > self.max_entries:
+                evicted_key, (_, evicted_bucket, evicted_embedding) = self._exact.popitem(last=False)
+                if evicted_embedding is not None:
+                    keys = self._semantic[evicted_bucket]
+                    keys.remove(evicted_key)
+                    self._matrices.pop(evicted_bucket, None)
+                    if not keys:
+                        del self._semantic[evicted_bucket]
+
+    def clear(self):
+        """Clear all cached responses."""
+        with self._lock:
+            self._exact.clear()
+            self._semantic.clear()
+            self._matrices.clear()
+            self._last_embedding = (None, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = sum(self.stats.values())
+            hits = self.stats['exact_hits'] + self.stats['semantic_hits']
+            return {
+                **self.stats,
+                'size': len(self._exact),
+                'hit_rate_percent': (hits / lookups * 100) if lookups else 0.0
+            }
+
+
+# Shared by all agents so responses survive per-request workflow construction
+default_response_cache = HatResponseCache()
@@ -1,16 +1,46 @@
 """Specialized thinking hat agents with search integration for phased execution."""
 
-import time
-from typing import Dict, List, Any, Optional
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, ClassVar, Dict, Any, Mapping, Optional, Sequence
 from .base_agent import BaseThinkingHatAgent, AgentProcessingResult, AgentFactory
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
-from services.phased_search_orchestrator import HatSearchContext
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+try:
+    import orjson
+except ImportError:  # Optional accelerator; the standard json module is used instead
+    orjson = None
+
+
+def _dumps_json(payload: Any) -> str:
+    """Serialize prompt context as compact JSON, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+
+
+class ParallelHatAgent(BaseThinkingHatAgent):
+    """Shared process() for the hats that run in parallel on the query and their own search."""
+
+    __slots__ = ()
+
+    async def process(
+        self,
+        query: str,
+        search_context: Optional[Sequence[Mapping[str, Any]]] = None
+    ) -> AgentProcessingResult:
+        """Process query with optional search context."""
+        return await self._invoke(query, search_context)
 
 
-class WhiteHatAgent(BaseThinkingHatAgent):
+class WhiteHatAgent(ParallelHatAgent):
     """White Hat Agent - Facts and data specialist."""
 
+    __slots__ = ()
+
     def __init__(self, llm: ChatOpenAI):
         system_prompt = """You are the White Hat. You represent neutrality and facts.
 
@@ -30,45 +60,12 @@ Response guidelines:
 
         super().__init__(llm, "white_hat", system_prompt)
 
-    def process(
-        self,
-        query: str,
-        search_context: Optional[List[Dict[str, Any]]] = None
-    ) -> AgentProcessingResult:
-        """Process query with optional search context."""
-        start_time = time.time()
-
-        # Set search results if provided
-        if search_context:
-            self.set_search_results(search_context, {})
-
-        # Build message with search context
-        messages = [self.create_system_message()]
-        messages.append(HumanMessage(content=query)) # type: ignore
-
-        try:
-            response = self.llm.invoke(messages)
-            execution_time = time.time() - start_time
-            return AgentProcessingResult(
-                agent_name="white_hat",
-                response=response.content, # type: ignore
-                processing_time=execution_time,
-                search_used=search_context is not None
-            )
-        except Exception as e:
-            execution_time = time.time() - start_time
-            return AgentProcessingResult(
-                agent_name="white_hat",
-                response=f"Error: {str(e)}",
-                processing_time=execution_time,
-                search_used=search_context is not None,
-                error=str(e)
-            )
-
-
-class RedHatAgent(BaseThinkingHatAgent):
+
+class RedHatAgent(ParallelHatAgent):
     """Red Hat Agent - Emotions and feelings specialist."""
 
+    __slots__ = ()
+
     def __init__(self, llm: ChatOpenAI):
         system_prompt = """You are the Red Hat. You represent emotions and feelings.
 
@@ -89,45 +86,12 @@ Response guidelines:
 
         super().__init__(llm, "red_hat", system_prompt)
 
-    def process(
-        self,
-        query: str,
-        search_context: Optional[List[Dict[str, Any]]] = None
-    ) -> AgentProcessingResult:
-        """Process query with optional search context."""
-        start_time = time.time()
-
-        # Set search results if provided
-        if search_context:
-            self.set_search_results(search_context, {})
-
-        # Build message with search context
-        messages = [self.create_system_message()]
-        messages.append(HumanMessage(content=query)) # type: ignore
-
-        try:
-            response = self.llm.invoke(messages)
-            execution_time = time.time() - start_time
-            return AgentProcessingResult(
-                agent_name="red_hat",
-                response=response.content, # type: ignore
-                processing_time=execution_time,
-                search_used=search_context is not None
-            )
-        except Exception as e:
-            execution_time = time.time() - start_time
-            return AgentProcessingResult(
-                agent_name="red_hat",
-                response=f"Error: {str(e)}",
-                processing_time=execution_time,
-                search_used=search_context is not None,
-                error=str(e)
-            )
-
-
-class YellowHatAgent(BaseThinkingHatAgent):
+
+class YellowHatAgent(ParallelHatAgent):
     """Yellow Hat Agent - Optimism and benefits specialist."""
 
+    __slots__ = ()
+
     def __init__(self, llm: ChatOpenAI):
         system_prompt = """You are the Yellow Hat. You represent optimism and positive thinking.
 
@@ -149,43 +113,12 @@ Response guidelines:
 
         super().__init__(llm, "yellow_hat", system_prompt)
 
-    def process(
-        self,
-        query: str,
-        search_context: Optional[List[Dict[str, Any]]] = None
-    ) -> AgentProcessingResult:
-        """Process query with optional search context."""
-        start_time = time.time()
-
-        if search_context:
-            self.set_search_results(search_context, {})
-
-        messages = [self.create_system_message()]
-        messages.append(HumanMessage(content=query)) # type: ignore
-
-        try:
-            response = self.llm.invoke(messages)
-            execution_time = time.time() - start_time
-            return AgentProcessingResult(
-                agent_name="yellow_hat",
-                response=response.content, # type: ignore
-                processing_time=execution_time,
-                search_used=search_context is not None
-            )
-        except Exception as e:
-            execution_time = time.time() - start_time
-            return AgentProcessingResult(
-                agent_name="yellow_hat",
-                response=f"Error: {str(e)}",
-                processing_time=execution_time,
-                search_used=search_context is not None,
-                error=str(e)
-            )
-
-
-class BlackHatAgent(BaseThinkingHatAgent):
+
+class BlackHatAgent(ParallelHatAgent):
     """Black Hat Agent - Risks and problems specialist."""
 
+    __slots__ = ()
+
     def __init__(self, llm: ChatOpenAI):
         system_prompt = """You are the Black Hat. You represent caution and risk assessment.
 
@@ -207,43 +140,12 @@ Response guidelines:
 
         super().__init__(llm, "black_hat", system_prompt)
 
-    def process(
-        self,
-        query: str,
-        search_context: Optional[List[Dict[str, Any]]] = None
-    ) -> AgentProcessingResult:
-        """Process query with optional search context."""
-        start_time = time.time()
-
-        if search_context:
-            self.set_search_results(search_context, {})
-
-        messages = [self.create_system_message()]
-        messages.append(HumanMessage(content=query)) # type: ignore
-
-        try:
-            response = self.llm.invoke(messages)
-            execution_time = time.time() - start_time
-            return AgentProcessingResult(
-                agent_name="black_hat",
-                response=response.content, # type: ignore
-                processing_time=execution_time,
-                search_used=search_context is not None
-            )
-        except Exception as e:
-            execution_time = time.time() - start_time
-            return AgentProcessingResult(
-                agent_name="black_hat",
-                response=f"Error: {str(e)}",
-                processing_time=execution_time,
-                search_used=search_context is not None,
-                error=str(e)
-            )
-
 
 class GreenHatAgent(BaseThinkingHatAgent):
     """Green Hat Agent - Creativity and innovation specialist."""
 
+    __slots__ = ()
+
     def __init__(self, llm: ChatOpenAI):
         system_prompt = """You are the Green Hat. You represent creativity and innovation.
 
@@ -267,69 +169,42 @@ Response guidelines:
 
         super().__init__(llm, "green_hat", system_prompt)
 
-    def process(
+    async def process(
         self,
         query: str,
         aggregated_context: Optional[Dict[str, Any]] = None,
-        search_context: Optional[List[Dict[str, Any]]] = None
+        search_context: Optional[Sequence[Mapping[str, Any]]] = None
     ) -> AgentProcessingResult:
         """Process query with aggregated context from parallel hats and optional search."""
-        start_time = time.time()
-
-        # Set search results if provided
-        if search_context:
-            self.set_search_results(search_context, {})
-
-        # Build enhanced context with aggregated perspectives
-        enhanced_context = self.system_prompt
+        # Per-call context with aggregated perspectives, serialized in one
+        # call and sent as a second system message after the (cached) hat prompt
+        extra_system = None
 
         if aggregated_context:
-            enhanced_context += "\n\n## Aggregated Perspectives from Parallel Hats:\n"
-
-            # Add parallel hat responses
-            parallel_responses = aggregated_context.get('parallel_responses', {})
-            for hat_name, response in parallel_responses.items():
-                enhanced_context += f"\n### {hat_name.upper()} Hat Perspective:\n{response}\n"
-
-            # Add key themes
-            themes = aggregated_context.get('key_themes', [])
-            if themes:
-                enhanced_context += f"\n### Key Themes Identified:\n" + ", ".join(themes)
-
-            # Add synthesis opportunities
-            opportunities = aggregated_context.get('synthesis_opportunities', [])
-            if opportunities:
-                enhanced_context += f"\n\n### Synthesis Opportunities:\n"
-                for opp in opportunities:
-                    enhanced_context += f"- {opp}\n"
-
-        # Create messages
-        messages = [SystemMessage(content=enhanced_context)]
-        messages.append(HumanMessage(content=query)) # type: ignore
-
-        try:
-            response = self.llm.invoke(messages)
-            execution_time = time.time() - start_time
-            return AgentProcessingResult(
-                agent_name="green_hat",
-                response=response.content, # type: ignore
-                processing_time=execution_time,
-                search_used=search_context is not None
-            )
-        except Exception as e:
-            execution_time = time.time() - start_time
-            return AgentProcessingResult(
-                agent_name="green_hat",
-                response=f"Error: {str(e)}",
-                processing_time=execution_time,
-                search_used=search_context is not None,
-                error=str(e)
-            )
+            payload = {
+                'parallel_responses': aggregated_context.get('parallel_responses', {}),
+                'key_themes': aggregated_context.get('key_themes', []),
+                'synthesis_opportunities': aggregated_context.get('synthesis_opportunities', [])
+            }
+            extra_system = f"## Aggregated Perspectives from Parallel Hats (JSON):\n```json\n{_dumps_json(payload)}\n```"
+
+        return await self._invoke(query, search_context, extra_system=extra_system)
 
 
 class BlueHatAgent(BaseThinkingHatAgent):
     """Blue Hat Agent - Process and summary specialist."""
 
+    __slots__ = ()
+
+    # Display names for each perspective in the synthesis prompt
+    _HAT_NAMES: ClassVar[Dict[str, str]] = {
+        'white': 'White Hat (Facts)',
+        'red': 'Red Hat (Emotions)',
+        'yellow': 'Yellow Hat (Benefits)',
+        'black': 'Black Hat (Risks)',
+        'green': 'Green Hat (Creativity)'
+    }
+
     def __init__(self, llm: ChatOpenAI):
         system_prompt = """You are the Blue Hat. You represent process and organization.
 
@@ -352,66 +227,38 @@ Response guidelines:
 
         super().__init__(llm, "blue_hat", system_prompt)
 
-    def process(
+    async def process(
         self,
         query: str,
         all_responses: Dict[str, str],
         synthesis_context: Optional[Dict[str, Any]] = None
     ) -> AgentProcessingResult:
         """Process query with all hat responses and synthesis context."""
-        start_time = time.time()
-
-        # Build enhanced context with all perspectives
-        enhanced_context = self.system_prompt
+        # Per-call context with all perspectives, serialized in one call and
+        # sent as a second system message after the (cached) hat prompt
+        payload: Dict[str, Any] = {}
 
         if all_responses:
-            enhanced_context += "\n\n## All Thinking Hat Perspectives:\n"
-
-            hat_names = {
-                'white': 'White Hat (Facts)',
-                'red': 'Red Hat (Emotions)',
-                'yellow': 'Yellow Hat (Benefits)',
-                'black': 'Black Hat (Risks)',
-                'green': 'Green Hat (Creativity)'
+            payload['perspectives'] = {
+                self._HAT_NAMES.get(hat_key, hat_key): response
+                for hat_key, response in all_responses.items()
             }
 
-            for hat_key, response in all_responses.items():
-                hat_name = hat_names.get(hat_key, hat_key)
-                enhanced_context += f"\n### {hat_name}:\n{response}\n"
-
         if synthesis_context:
-            enhanced_context += "\n### Search Evidence:\n"
-            search_evidence = synthesis_context.get('search_evidence', {})
-            for hat_type, evidence in search_evidence.items():
-                if evidence:
-                    enhanced_context += f"\n**{hat_type.upper()} Hat Evidence:**\n"
-                    for item in evidence[:2]:  # Top 2 pieces of evidence
-                        enhanced_context += f"- {item.get('title', '')}\n"
-
-            enhanced_context += f"\n{synthesis_context.get('synthesis_notes', '')}\n"
-
-        # Create messages
-        messages = [SystemMessage(content=enhanced_context)]
-        messages.append(HumanMessage(content=query)) # type: ignore
-
-        try:
-            response = self.llm.invoke(messages)
-            execution_time = time.time() - start_time
-            return AgentProcessingResult(
-                agent_name="blue_hat",
-                response=response.content, # type: ignore
-                processing_time=execution_time,
-                search_used=False  # Blue Hat doesn't use search directly in this architecture
-            )
-        except Exception as e:
-            execution_time = time.time() - start_time
-            return AgentProcessingResult(
-                agent_name="blue_hat",
-                response=f"Error: {str(e)}",
-                processing_time=execution_time,
-                search_used=False,
-                error=str(e)
-            )
+            # Top 2 pieces of evidence per hat
+            payload['search_evidence'] = {
+                hat_type: [item.get('title', '') for item in evidence[:2]]
+                for hat_type, evidence in synthesis_context.get('search_evidence', {}).items()
+                if evidence
+            }
+            payload['synthesis_notes'] = synthesis_context.get('synthesis_notes', '')
+
+        extra_system = None
+        if payload:
+            extra_system = f"## All Thinking Hat Perspectives (JSON):\n```json\n{_dumps_json(payload)}\n```"
+
+        # Blue Hat doesn't use search directly in this architecture
+        return await self._invoke(query, extra_system=extra_system)
 
 
 # Register all agents with the factory
@@ -1,4 +1,5 @@
 """Graph module for workflow orchestration and parallel processing."""
 
-# Using parallel_langgraph.py for parallel execution
-__all__ = []
+from .phased_workflow_graph import PhasedWorkflowGraph, WorkflowState, get_workflow
+
+__all__ = ['PhasedWorkflowGraph', 'WorkflowState', 'get_workflow']
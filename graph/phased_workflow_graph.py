@@ -5,14 +5,14 @@ This module implements the phased sequential workflow:
 
 Phase 0: Query Analysis & Search Orchestration
   → Query Analyzer (Manager Agent)
-  → Search Orchestrator
+  → Search Orchestrator (starts one search per hat)
 
 Phase 1: Parallel Hat Execution
   → White Hat (Facts)
   → Red Hat (Emotions)
   → Yellow Hat (Benefits)
   → Black Hat (Risks)
-  (All run in parallel)
+  (All run in parallel, each awaiting only its own search)
 
 Phase 2: Sequential Processing
   → Aggregator (collects parallel results)
@@ -24,14 +24,25 @@ Phase 3: Synthesis
 Uses LangGraph for state management and orchestration.
 """
 
-from typing import TypedDict, List, Dict, Optional, Any, Annotated
+from typing import TypedDict, List, Dict, Optional, Any, Annotated, AsyncIterator, Iterator, Tuple
+import asyncio
+import concurrent.futures
+import copy
+import hashlib
+import sys
+import threading
+import weakref
 from langgraph.graph import StateGraph, END
-from operator import add
+from langgraph.types import Send
+from operator import add, or_
+import dataclasses
 from langchain_core.language_models import BaseLanguageModel
 
 # Import agents and services
-from agents.manager_agent import ManagerAgent, QueryAnalysis
+from agents.manager_agent import ManagerAgent, QueryAnalysis, HatType
 from services.phased_search_orchestrator import PhasedSearchOrchestrator, HatSearchContext
+from services.ttl_cache import TTLCache
+from agents.base_agent import AgentPool, format_error
 from agents.thinking_hat_agents import (
     WhiteHatAgent,
     RedHatAgent,
@@ -41,6 +52,98 @@ from agents.thinking_hat_agents import (
     BlueHatAgent
 )
 
+try:
+    import uvloop
+except ImportError:  # Optional accelerator; the default asyncio loop is used instead
+    uvloop = None
+
+
+# Fallback response text per hat, shown when a hat node fails
+_HAT_ERROR_RESPONSES = {
+    'white': "Error: Unable to process White Hat perspective.",
+    'red': "Error: Unable to process Red Hat perspective.",
+    'yellow': "Error: Unable to process Yellow Hat perspective.",
+    'black': "Error: Unable to process Black Hat perspective.",
+    'green': "Error: Unable to process Green Hat perspective.",
+    'blue': "Error: Unable to process Blue Hat summary."
+}
+
+
+# Phase of each workflow node, for streamed events
+_NODE_PHASES = {
+    'query_analyzer': 'phase_0_analysis',
+    'search_orchestrator': 'phase_0_analysis',
+    'search_results': 'phase_0_analysis',
+    'white_hat': 'phase_1_parallel',
+    'red_hat': 'phase_1_parallel',
+    'yellow_hat': 'phase_1_parallel',
+    'black_hat': 'phase_1_parallel',
+    'green_search': 'phase_2_sequential',
+    'aggregator': 'phase_2_sequential',
+    'green_hat': 'phase_2_sequential',
+    'blue_hat': 'phase_3_synthesis'
+}
+
+# Result handed to callers joined to a run whose owner gave it up; they retry
+_ABANDONED_RUN = object()
+
+# State keys each node writes, for replaying a completed run as node events.
+# Blue Hat runs last and replays with the accumulated stats, errors and phases.
+_NODE_OUTPUTS = {
+    'query_analyzer': ('query_analysis',),
+    'search_results': ('search_contexts',),
+    'white_hat': ('white_response',),
+    'red_hat': ('red_response',),
+    'yellow_hat': ('yellow_response',),
+    'black_hat': ('black_response',),
+    'green_search': ('green_search_context',),
+    'aggregator': ('green_context',),
+    'green_hat': ('green_response',),
+    'blue_hat': ('blue_response', 'processing_stats', 'errors', 'phase_completed')
+}
+
+
+def _context_size(context: Any) -> int:
+    """
+    Approximate size of a context for stats: total characters of its strings.
+
+    Walks nested dicts and sequences without building a repr, unlike
+    len(str(context)). Other leaf values count as one.
+    """
+    size = 0
+    stack = [context]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            size += len(item)
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif item is not None:
+            size += 1
+    return size
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Create an event loop for running the workflow.
+
+    Uses uvloop when it is installed (not available on Windows), which has
+    cheaper task scheduling and callbacks than the default selector loop.
+    On Python 3.12+ tasks start eagerly, so coroutines that finish without
+    suspending (cached hat responses, early errors) skip a trip through the
+    loop's scheduler.
+
+    Callers creating their own loop should use this rather than
+    asyncio.new_event_loop() to get the same behaviour.
+    """
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    if sys.version_info >= (3, 12):
+        loop.set_task_factory(asyncio.eager_task_factory) # type: ignore[attr-defined]
+    return loop
+
 
 class WorkflowState(TypedDict):
     """State managed by LangGraph throughout the workflow"""
@@ -49,6 +152,7 @@ class WorkflowState(TypedDict):
 
     # Phase 0: Analysis (only written by analysis nodes)
     query_analysis: Optional[QueryAnalysis]
+    search_wave: Optional["SearchWave"]
     search_contexts: Optional[Dict[str, HatSearchContext]]
 
     # Phase 1: Parallel hat responses (each hat writes to its own field)
@@ -58,6 +162,7 @@ class WorkflowState(TypedDict):
     black_response: Optional[str]
 
     # Phase 2: Sequential processing (only written by sequential nodes)
+    green_search_context: Optional[HatSearchContext]
     green_context: Optional[Dict[str, Any]]
     green_response: Optional[str]
 
@@ -65,11 +170,29 @@ class WorkflowState(TypedDict):
     blue_response: Optional[str]
 
     # Metadata (accumulated throughout - use Annotated with reducer)
-    processing_stats: Annotated[Dict[str, Any], lambda x, y: {**x, **y}]
+    # Reducers must not mutate their inputs: LangGraph applies writes to
+    # shallow channel copies when evaluating conditional edges
+    processing_stats: Annotated[Dict[str, Any], or_]
     errors: Annotated[List[str], add]
     phase_completed: Annotated[List[str], add]
 
 
+@dataclasses.dataclass(slots=True)
+class SearchWave:
+    """Initial search wave in flight: one future per hat, resolving to its HatSearchContext"""
+    futures: Dict[str, "asyncio.Future[HatSearchContext]"]
+
+
+class HatTask(TypedDict):
+    """Input sent to each Phase 1 hat node instead of the full workflow state"""
+    query: str
+    search_task: Optional["asyncio.Future[HatSearchContext]"]
+
+
+# Phase 1 hats, fanned out from the search orchestrator with Send
+PARALLEL_HATS = ('white', 'red', 'yellow', 'black')
+
+
 class PhasedWorkflowGraph:
     """
     Phased Workflow Graph orchestrating the sequential Six Thinking Hats process.
@@ -87,21 +210,42 @@ class PhasedWorkflowGraph:
         self,
         llm: BaseLanguageModel,
         search_api: Any,
-        max_searches_per_query: int = 4
+        max_searches_per_query: int = 4,
+        max_concurrent_llm_calls: int = 4,
+        result_cache_size: int = 256,
+        result_cache_ttl_seconds: float = 300,
+        agent_pool_size: int = 2
     ):
         self.llm = llm
         self.search_api = search_api
         self.max_searches = max_searches_per_query
 
+        # Caps in-flight hat LLM calls to respect provider rate limits. A
+        # semaphore is bound to one event loop, and the sync wrappers start a
+        # new loop per call, so each loop gets its own.
+        self.max_concurrent_llm_calls = max_concurrent_llm_calls
+        self._llm_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._llm_semaphores_lock = threading.Lock()
+
+        # In-flight runs by query key; concurrent identical queries await one
+        # run. Thread-safe futures so callers on other event loops can join.
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Completed error-free runs, so exact repeats skip search and LLM calls
+        self.result_cache = TTLCache(maxsize=result_cache_size, ttl_seconds=result_cache_ttl_seconds)
+
         # Initialize agents
         self.manager_agent = ManagerAgent(llm)
         self.search_orchestrator = PhasedSearchOrchestrator(search_api, max_searches_per_query)
-        self.white_hat = WhiteHatAgent(llm) # type: ignore
-        self.red_hat = RedHatAgent(llm) # type: ignore
-        self.yellow_hat = YellowHatAgent(llm) # type: ignore
-        self.black_hat = BlackHatAgent(llm) # type: ignore
-        self.green_hat = GreenHatAgent(llm) # type: ignore
-        self.blue_hat = BlueHatAgent(llm) # type: ignore
+        # Hat agents are leased per call from this graph's pool, so they are
+        # reused across queries and dropped with the graph. The pool is sized
+        # for the expected number of concurrent queries and filled during the
+        # first run, overlapping query analysis and search.
+        self.agent_pool = AgentPool(llm)
+        self.agent_pool_size = agent_pool_size
+        self._agent_pools_filled = False
+        self._agent_pools_lock = threading.Lock()
 
         # Build workflow graph
         self.workflow = self._build_workflow()
@@ -114,6 +258,7 @@ class PhasedWorkflowGraph:
         # Phase 0: Management
         workflow.add_node("query_analyzer", self._query_analyzer_node)
         workflow.add_node("search_orchestrator", self._search_orchestrator_node)
+        workflow.add_node("search_results", self._search_results_node)
 
         # Phase 1: Parallel execution
         workflow.add_node("white_hat", self._white_hat_node)
@@ -121,7 +266,9 @@ class PhasedWorkflowGraph:
         workflow.add_node("yellow_hat", self._yellow_hat_node)
         workflow.add_node("black_hat", self._black_hat_node)
 
-        # Phase 2: Sequential processing
+        # Phase 2: Sequential processing. Green Hat's search only needs the
+        # query analysis, so it runs alongside the parallel hats.
+        workflow.add_node("green_search", self._green_search_node)
         workflow.add_node("aggregator", self._aggregator_node)
         workflow.add_node("green_hat", self._green_hat_node)
 
@@ -134,11 +281,14 @@ class PhasedWorkflowGraph:
         workflow.set_entry_point("query_analyzer")
         workflow.add_edge("query_analyzer", "search_orchestrator")
 
-        # From search orchestrator to parallel hats
-        workflow.add_edge("search_orchestrator", "white_hat")
-        workflow.add_edge("search_orchestrator", "red_hat")
-        workflow.add_edge("search_orchestrator", "yellow_hat")
-        workflow.add_edge("search_orchestrator", "black_hat")
+        # From search orchestrator to parallel hats, each sent only its inputs
+        workflow.add_conditional_edges(
+            "search_orchestrator",
+            self._route_parallel_hats,
+            [f"{hat}_hat" for hat in PARALLEL_HATS]
+        )
+        workflow.add_edge("search_orchestrator", "search_results")
+        workflow.add_edge("search_orchestrator", "green_search")
 
         # Collect parallel results
         workflow.add_edge("white_hat", "aggregator")
@@ -146,19 +296,32 @@ class PhasedWorkflowGraph:
         workflow.add_edge("yellow_hat", "aggregator")
         workflow.add_edge("black_hat", "aggregator")
 
-        # Sequential flow
-        workflow.add_edge("aggregator", "green_hat")
+        # Sequential flow; Green Hat waits for both the aggregate and its search
+        workflow.add_edge(["aggregator", "green_search"], "green_hat")
         workflow.add_edge("green_hat", "blue_hat")
         workflow.add_edge("blue_hat", END)
 
-        # Draw the graph
-        try:
-            workflow.compile().get_graph(xray=True).draw_mermaid_png(output_file_path="graph.png")
-        except Exception:
-            pass
-
         return workflow.compile() # type: ignore
 
+    def draw_graph(self, output_file_path: str = "graph.png"):
+        """
+        Render the workflow diagram to a PNG.
+
+        Rendering goes out to the Mermaid web service, so it is kept off the
+        construction path; run `python -m graph.phased_workflow_graph` to
+        refresh graph.png.
+        """
+        self.workflow.get_graph(xray=True).draw_mermaid_png(output_file_path=output_file_path)
+
+    def _llm_slot(self) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent hat LLM calls on the running loop"""
+        loop = asyncio.get_running_loop()
+        with self._llm_semaphores_lock:
+            semaphore = self._llm_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._llm_semaphores[loop] = asyncio.Semaphore(self.max_concurrent_llm_calls)
+        return semaphore
+
     def _query_analyzer_node(self, state: WorkflowState) -> WorkflowState:
         """Phase 0: Analyze query and determine search strategy"""
 
@@ -180,171 +343,232 @@ class PhasedWorkflowGraph:
 
         except Exception as e:
             return {
-                'errors': [f"Query analysis failed: {str(e)}"]
+                'errors': [f"Query analysis failed: {format_error(e)}"]
             } # type: ignore
 
-    def _search_orchestrator_node(self, state: WorkflowState) -> WorkflowState:
+    async def _search_orchestrator_node(self, state: WorkflowState) -> WorkflowState:
         """Phase 0: Execute initial search wave for parallel hats"""
 
         try:
             query_analysis = state['query_analysis']
 
             # Get search queries for allocated hats
+            search_queries = query_analysis.search_queries_as_dict() # type: ignore
             hat_search_queries = {
-                hat_type.value: query_analysis.search_queries.get(hat_type, "") # type: ignore
+                hat_type.key: search_queries.get(hat_type, "")
                 for hat_type in query_analysis.budget_allocation # type: ignore
             }
 
-            # Execute search wave
-            search_contexts = self.search_orchestrator.execute_initial_search_wave(
-                hat_search_queries
-            )
+            # Start the search wave; repeated searches are served by the
+            # orchestrator's cache. Hats await only their own search, so none
+            # waits for the slowest.
+            futures = self.search_orchestrator.schedule_initial_search_wave(hat_search_queries)
+
+            return {
+                'search_wave': SearchWave(futures)
+            } # type: ignore
 
+        except Exception as e:
             return {
+                'errors': [f"Search orchestration failed: {format_error(e)}"]
+            } # type: ignore
+
+    async def _search_results_node(self, state: WorkflowState) -> WorkflowState:
+        """Phase 0: Collect the search wave's contexts and stats once all searches finish"""
+
+        try:
+            search_wave = state.get('search_wave')
+            if search_wave is None:
+                return {} # type: ignore
+
+            # Hats fall back to no search when theirs failed; report the failure here, once
+            contexts = await asyncio.gather(*search_wave.futures.values(), return_exceptions=True)
+
+            search_contexts = {}
+            failure = None
+            for hat_type, ctx in zip(search_wave.futures, contexts):
+                if isinstance(ctx, BaseException):
+                    failure = failure or ctx
+                else:
+                    search_contexts[hat_type] = ctx
+
+            cache_hits = 0
+            execution_time = 0.0
+            for ctx in search_contexts.values():
+                cache_hits += ctx.cache_hit
+                execution_time += ctx.execution_time
+
+            update = {
                 'search_contexts': search_contexts,
                 'processing_stats': {
                     'search': {
                         'total_searches': len(search_contexts),
-                        'cache_hits': sum(1 for ctx in search_contexts.values() if ctx.cache_hit),
-                        'execution_time': sum(ctx.execution_time for ctx in search_contexts.values())
+                        'cache_hits': cache_hits,
+                        'execution_time': execution_time
                     }
                 },
                 'phase_completed': ['search_orchestration']
-            } # type: ignore
+            }
+            if failure is not None:
+                update['errors'] = [f"Search orchestration failed: {format_error(failure)}"]
+            return update # type: ignore
 
         except Exception as e:
             return {
-                'errors': [f"Search orchestration failed: {str(e)}"]
+                'errors': [f"Search orchestration failed: {format_error(e)}"]
             } # type: ignore
 
-    def _white_hat_node(self, state: WorkflowState) -> WorkflowState:
+    @staticmethod
+    async def _hat_search_context(
+        search_task: Optional["asyncio.Future[HatSearchContext]"]
+    ) -> Optional[HatSearchContext]:
+        """
+        Await a Phase 1 hat's own search.
+
+        A failed search leaves the hat to answer without search results; the
+        failure is reported once, by the search_results node.
+        """
+        if search_task is None:
+            return None
+        try:
+            return await search_task
+        except Exception:
+            return None
+
+    def _route_parallel_hats(self, state: WorkflowState) -> List[Send]:
+        """Send each Phase 1 hat the query and its own pending search"""
+        query = state['query']
+        search_wave = state.get('search_wave')
+        futures = search_wave.futures if search_wave else {}
+        return [
+            Send(f"{hat}_hat", {'query': query, 'search_task': futures.get(hat)})
+            for hat in PARALLEL_HATS
+        ]
+
+    async def _white_hat_node(self, task: HatTask) -> WorkflowState:
         """Phase 1: White Hat - Facts and Data Analysis"""
 
         try:
-            query = state['query']
-            search_context = state['search_contexts'].get('white') if state.get('search_contexts') else None # type: ignore
+            query = task['query']
+            search_context = await self._hat_search_context(task['search_task'])
 
-            response = self.white_hat.process(
-                query=query,
-                search_context=search_context.search_results if search_context else None
-            )
+            async with self._llm_slot():
+                with self.agent_pool.leased("white_hat") as white_hat:
+                    response = await white_hat.process( # type: ignore
+                        query=query,
+                        search_context=search_context.search_results if search_context else None
+                    )
 
             return {
                 'white_response': response.response,
                 'processing_stats': {
                     'white_hat': {
                         'execution_time': response.processing_time,
-                        'search_used': search_context is not None,
+                        'search_used': response.search_used,
                         'response_length': len(response.response)
                     }
                 }
             } # type: ignore
 
         except Exception as e:
-            return {
-                'white_response': f"Error: Unable to process White Hat perspective.",
-                'errors': [f"White hat failed: {str(e)}"]
-            } # type: ignore
+            return self._hat_error('white', e)
 
-    def _red_hat_node(self, state: WorkflowState) -> WorkflowState:
+    async def _red_hat_node(self, task: HatTask) -> WorkflowState:
         """Phase 1: Red Hat - Emotions and Feelings"""
 
         try:
-            query = state['query']
-            search_context = state['search_contexts'].get('red') if state.get('search_contexts') else None # type: ignore
+            query = task['query']
+            search_context = await self._hat_search_context(task['search_task'])
 
-            response = self.red_hat.process(
-                query=query,
-                search_context=search_context.search_results if search_context else None
-            )
+            async with self._llm_slot():
+                with self.agent_pool.leased("red_hat") as red_hat:
+                    response = await red_hat.process( # type: ignore
+                        query=query,
+                        search_context=search_context.search_results if search_context else None
+                    )
 
             return {
                 'red_response': response.response,
                 'processing_stats': {
                     'red_hat': {
                         'execution_time': response.processing_time,
-                        'search_used': search_context is not None,
+                        'search_used': response.search_used,
                         'response_length': len(response.response)
                     }
                 }
             } # type: ignore
 
         except Exception as e:
-            return {
-                'red_response': f"Error: Unable to process Red Hat perspective.",
-                'errors': [f"Red hat failed: {str(e)}"]
-            } # type: ignore
+            return self._hat_error('red', e)
 
-    def _yellow_hat_node(self, state: WorkflowState) -> WorkflowState:
+    async def _yellow_hat_node(self, task: HatTask) -> WorkflowState:
         """Phase 1: Yellow Hat - Benefits and Opportunities"""
 
         try:
-            query = state['query']
-            search_context = state['search_contexts'].get('yellow') if state.get('search_contexts') else None # type: ignore
+            query = task['query']
+            search_context = await self._hat_search_context(task['search_task'])
 
-            response = self.yellow_hat.process(
-                query=query,
-                search_context=search_context.search_results if search_context else None
-            )
+            async with self._llm_slot():
+                with self.agent_pool.leased("yellow_hat") as yellow_hat:
+                    response = await yellow_hat.process( # type: ignore
+                        query=query,
+                        search_context=search_context.search_results if search_context else None
+                    )
 
             return {
                 'yellow_response': response.response,
                 'processing_stats': {
                     'yellow_hat': {
                         'execution_time': response.processing_time,
-                        'search_used': search_context is not None,
+                        'search_used': response.search_used,
                         'response_length': len(response.response)
                     }
                 }
             } # type: ignore
 
         except Exception as e:
-            return {
-                'yellow_response': f"Error: Unable to process Yellow Hat perspective.",
-                'errors': [f"Yellow hat failed: {str(e)}"]
-            } # type: ignore
+            return self._hat_error('yellow', e)
 
-    def _black_hat_node(self, state: WorkflowState) -> WorkflowState:
+    async def _black_hat_node(self, task: HatTask) -> WorkflowState:
         """Phase 1: Black Hat - Risks and Problems"""
 
         try:
-            query = state['query']
-            search_context = state['search_contexts'].get('black') if state.get('search_contexts') else None # type: ignore
+            query = task['query']
+            search_context = await self._hat_search_context(task['search_task'])
 
-            response = self.black_hat.process(
-                query=query,
-                search_context=search_context.search_results if search_context else None
-            )
+            async with self._llm_slot():
+                with self.agent_pool.leased("black_hat") as black_hat:
+                    response = await black_hat.process( # type: ignore
+                        query=query,
+                        search_context=search_context.search_results if search_context else None
+                    )
 
             return {
                 'black_response': response.response,
                 'processing_stats': {
                     'black_hat': {
                         'execution_time': response.processing_time,
-                        'search_used': search_context is not None,
+                        'search_used': response.search_used,
                         'response_length': len(response.response)
                     }
                 }
             } # type: ignore
 
         except Exception as e:
-            return {
-                'black_response': f"Error: Unable to process Black Hat perspective.",
-                'errors': [f"Black hat failed: {str(e)}"]
-            } # type: ignore
+            return self._hat_error('black', e)
 
     def _aggregator_node(self, state: WorkflowState) -> WorkflowState:
         """Phase 2: Aggregate parallel hat results for Green Hat"""
 
-        try:
-            # Collect all parallel hat responses
-            hat_responses = {
-                'white': state.get('white_response', ''),
-                'red': state.get('red_response', ''),
-                'yellow': state.get('yellow_response', ''),
-                'black': state.get('black_response', '')
-            }
+        # Collect all parallel hat responses
+        hat_responses = {
+            'white': state.get('white_response', ''),
+            'red': state.get('red_response', ''),
+            'yellow': state.get('yellow_response', ''),
+            'black': state.get('black_response', '')
+        }
 
+        try:
             # Build aggregated context
             aggregated_context = self.search_orchestrator.aggregate_hat_contexts(
                 hat_responses, # type: ignore
@@ -355,7 +579,7 @@ class PhasedWorkflowGraph:
                 'green_context': aggregated_context,
                 'processing_stats': {
                     'aggregator': {
-                        'context_size': len(str(aggregated_context)),
+                        'context_size': _context_size(aggregated_context),
                         'themes_identified': len(aggregated_context.get('key_themes', [])),
                         'synthesis_opportunities': len(aggregated_context.get('synthesis_opportunities', []))
                     }
@@ -365,69 +589,75 @@ class PhasedWorkflowGraph:
 
         except Exception as e:
             return {
-                'green_context': {
-                    'parallel_responses': {
-                        'white': state.get('white_response', ''),
-                        'red': state.get('red_response', ''),
-                        'yellow': state.get('yellow_response', ''),
-                        'black': state.get('black_response', '')
-                    }
-                },
-                'errors': [f"Aggregation failed: {str(e)}"]
+                'green_context': {'parallel_responses': hat_responses},
+                'errors': [f"Aggregation failed: {format_error(e)}"]
             } # type: ignore
 
-    def _green_hat_node(self, state: WorkflowState) -> WorkflowState:
-        """Phase 2: Green Hat - Creative Solutions"""
+    async def _green_search_node(self, state: WorkflowState) -> WorkflowState:
+        """Phase 2: Green Hat search, run while the parallel hats are thinking"""
 
         try:
-            query = state['query']
-            aggregated_context = state.get('green_context', {})
-            search_context = state['search_contexts'].get('green') if state.get('search_contexts') else None # type: ignore
-
             # Check if Green Hat should search (budget allows and complexity warrants)
             query_analysis = state.get('query_analysis')
-            budget_used = len(state.get('search_contexts', {})) # type: ignore
+            search_queries = query_analysis.search_queries_as_dict() if query_analysis else {}
+            # Each hat in the initial wave used one search; no need to wait for them
+            search_wave = state.get('search_wave')
+            budget_used = len(search_wave.futures) if search_wave else 0
             should_green_search = (
-                query_analysis and
-                query_analysis.search_recommendations.get('green') and # type: ignore
+                HatType.GREEN in search_queries and
                 budget_used < self.max_searches
             )
 
             green_search_context = None
             if should_green_search:
-                green_search_context = self.search_orchestrator.execute_sequential_search(
+                green_search_context = await self.search_orchestrator.aexecute_sequential_search(
                     hat_type='green',
-                    search_query=query_analysis.search_queries.get('green', ''), # type: ignore
-                    current_budget_used=budget_used,
-                    context=aggregated_context
+                    search_query=search_queries[HatType.GREEN],
+                    current_budget_used=budget_used
                 )
 
-            response = self.green_hat.process(
-                query=query,
-                aggregated_context=aggregated_context,
-                search_context=green_search_context.search_results if green_search_context else None
-            )
+            return {
+                'green_search_context': green_search_context
+            } # type: ignore
+
+        except Exception as e:
+            return {
+                'errors': [f"Green hat search failed: {format_error(e)}"]
+            } # type: ignore
+
+    async def _green_hat_node(self, state: WorkflowState) -> WorkflowState:
+        """Phase 2: Green Hat - Creative Solutions"""
+
+        try:
+            query = state['query']
+            aggregated_context = state.get('green_context', {})
+            green_search_context = state.get('green_search_context')
+
+            async with self._llm_slot():
+                with self.agent_pool.leased("green_hat") as green_hat:
+                    response = await green_hat.process( # type: ignore
+                        query=query,
+                        aggregated_context=aggregated_context,
+                        search_context=green_search_context.search_results if green_search_context else None
+                    )
 
             return {
                 'green_response': response.response,
                 'processing_stats': {
                     'green_hat': {
                         'execution_time': response.processing_time,
-                        'search_used': green_search_context is not None,
+                        'search_used': response.search_used,
                         'response_length': len(response.response),
-                        'aggregated_context_size': len(str(aggregated_context))
+                        'aggregated_context_size': _context_size(aggregated_context)
                     }
                 },
                 'phase_completed': ['green_hat']
             } # type: ignore
 
         except Exception as e:
-            return {
-                'green_response': f"Error: Unable to process Green Hat perspective.",
-                'errors': [f"Green hat failed: {str(e)}"]
-            } # type: ignore
+            return self._hat_error('green', e)
 
-    def _blue_hat_node(self, state: WorkflowState) -> WorkflowState:
+    async def _blue_hat_node(self, state: WorkflowState) -> WorkflowState:
         """Phase 3: Blue Hat - Final Synthesis"""
 
         try:
@@ -452,11 +682,13 @@ class PhasedWorkflowGraph:
                 search_contexts=state.get('search_contexts', {}) # type: ignore
             )
 
-            response = self.blue_hat.process(
-                query=query,
-                all_responses=all_responses, # type: ignore
-                synthesis_context=synthesis_context
-            )
+            async with self._llm_slot():
+                with self.agent_pool.leased("blue_hat") as blue_hat:
+                    response = await blue_hat.process( # type: ignore
+                        query=query,
+                        all_responses=all_responses, # type: ignore
+                        synthesis_context=synthesis_context
+                    )
 
             # Calculate overall stats
             total_time = sum(
@@ -471,7 +703,7 @@ class PhasedWorkflowGraph:
                     'blue_hat': {
                         'execution_time': response.processing_time,
                         'response_length': len(response.response),
-                        'synthesis_context_size': len(str(synthesis_context))
+                        'synthesis_context_size': _context_size(synthesis_context)
                     },
                     'overall': {
                         'total_execution_time': total_time + response.processing_time,
@@ -483,72 +715,295 @@ class PhasedWorkflowGraph:
             } # type: ignore
 
         except Exception as e:
-            return {
-                'blue_response': f"Error: Unable to process Blue Hat summary.",
-                'errors': [f"Blue hat failed: {str(e)}"]
-            } # type: ignore
+            return self._hat_error('blue', e)
+
+    @staticmethod
+    def _hat_error(hat: str, error: Exception) -> WorkflowState:
+        """State update for a hat node that failed."""
+        return {
+            f'{hat}_response': _HAT_ERROR_RESPONSES[hat],
+            'errors': [f"{hat.capitalize()} hat failed: {format_error(error)}"]
+        } # type: ignore
 
-    def invoke(self, query: str) -> Dict[str, Any]:
+    async def ainvoke(self, query: str) -> Dict[str, Any]:
         """
         Invoke the workflow with a query.
 
+        The hat nodes are async, so the four parallel hats overlap their LLM
+        calls on the event loop. Repeats of a recently completed query are
+        served from the result cache, and identical queries arriving while a
+        run is in flight share that run's result instead of starting another.
+
         Args:
             query: User query
 
         Returns:
             Dictionary with all responses and metadata
         """
+        key = self._result_key(query)
+
+        # Callers get deep copies, so mutating a result cannot alter the cached run
+        result, owner = await self._cached_or_joined_result(key)
+        if owner is None:
+            return copy.deepcopy(result)
+
+        try:
+            result = await self._run_workflow(query)
+        except Exception as e:
+            self._fail_run(key, owner, e)
+            raise
+        except BaseException:
+            self._abandon_run(key, owner)
+            raise
+        return copy.deepcopy(self._complete_run(key, owner, result))
+
+    @staticmethod
+    def _result_key(query: str) -> str:
+        """Key for the result cache and in-flight runs; case and surrounding whitespace are ignored."""
+        return hashlib.sha1(query.strip().lower().encode()).hexdigest()
+
+    async def _cached_or_joined_result(
+        self, key: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[concurrent.futures.Future]]:
+        """
+        Find a cached or in-flight run for key, or register this caller to run it.
+
+        Returns (result, None) when another run produced the result, or
+        (None, owner) when this caller must run the query and settle owner.
+        If the run joined is abandoned, the next caller in takes it over.
+        """
+        while True:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached, None
+
+            with self._inflight_lock:
+                inflight = self._inflight.get(key)
+                if inflight is None:
+                    owner = concurrent.futures.Future()
+                    self._inflight[key] = owner
+                    return None, owner
+
+            # Shielded so a joiner's own cancellation leaves the shared run alone
+            result = await asyncio.shield(asyncio.wrap_future(inflight))
+            if result is not _ABANDONED_RUN:
+                return result, None
+
+    def _complete_run(
+        self, key: str, owner: concurrent.futures.Future, result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Cache an error-free result and hand it to callers that joined the run.
+
+        The search wave is dropped first: its futures belong to the run's
+        event loop, which may be closed by the time the result is reused.
+        """
+        result = {name: value for name, value in result.items() if name != 'search_wave'}
+        if not result.get('errors'):
+            self.result_cache.set(key, result)
+        with self._inflight_lock:
+            del self._inflight[key]
+        owner.set_result(result)
+        return result
+
+    def _fail_run(self, key: str, owner: concurrent.futures.Future, error: Exception):
+        """Pass a failed run's exception to callers that joined it."""
+        with self._inflight_lock:
+            del self._inflight[key]
+        owner.set_exception(error)
+        # Nobody else may be waiting; mark the exception as retrieved
+        owner.exception()
+
+    def _abandon_run(self, key: str, owner: concurrent.futures.Future):
+        """
+        Release a run whose owner was cancelled or stopped consuming it.
+
+        Joined callers are not failed with the owner's cancellation; they
+        retry, and one of them runs the query instead.
+        """
+        with self._inflight_lock:
+            del self._inflight[key]
+        owner.set_result(_ABANDONED_RUN)
+
+    def _start_agent_pool_fill(self) -> Optional[asyncio.Future]:
+        """Fill the agent pools on a worker thread while the workflow starts."""
+        with self._agent_pools_lock:
+            if self._agent_pools_filled:
+                return None
+            self._agent_pools_filled = True
+        return asyncio.get_running_loop().run_in_executor(None, self.agent_pool.fill, self.agent_pool_size)
+
+    async def _run_workflow(self, query: str) -> Dict[str, Any]:
+        """Run the compiled workflow once for a query."""
         initial_state: WorkflowState = {
             'query': query,
             'processing_stats': {},
             'errors': []
         } # type: ignore
 
-        final_state = self.workflow.invoke(initial_state) # type: ignore
+        pool_fill = self._start_agent_pool_fill()
+        try:
+            final_state = await self.workflow.ainvoke(initial_state) # type: ignore
+        finally:
+            if pool_fill is not None:
+                await pool_fill
 
         return final_state
 
-    def stream(self, query: str):
+    def invoke(self, query: str) -> Dict[str, Any]:
+        """Synchronous wrapper around ainvoke() for callers without an event loop."""
+        with asyncio.Runner(loop_factory=new_event_loop) as runner:
+            return runner.run(self.ainvoke(query))
+
+    async def astream(self, query: str, stream_tokens: bool = False) -> AsyncIterator[Dict[str, Any]]:
         """
         Stream results as they become available.
 
         Args:
             query: User query
+            stream_tokens: Also yield LLM tokens as each hat generates them,
+                so a caller can show Blue Hat's synthesis before it finishes
 
         Yields:
-            Dict with phase and data as results are computed
+            Dict with phase and data as results are computed; with stream_tokens,
+            also dicts with node, phase and a 'token' string. Repeats of a cached
+            or in-flight query replay the finished run as node events, without tokens.
         """
+        key = self._result_key(query)
+
+        result, owner = await self._cached_or_joined_result(key)
+        if owner is None:
+            for event in self._replay_events(result):
+                yield event
+            return
+
         initial_state: WorkflowState = {
             'query': query,
             'processing_stats': {},
             'errors': []
         } # type: ignore
 
-        # Stream through the workflow
-        for event in self.workflow.stream(initial_state): # type: ignore
-            node_name = list(event.keys())[0]
-            node_state = event[node_name]
+        final_state = initial_state
+        pool_fill = self._start_agent_pool_fill()
+        try:
+            # Stream through the workflow; "messages" carries LLM tokens as
+            # they arrive and "values" the accumulated state after each step
+            stream_mode = ["updates", "values", "messages"] if stream_tokens else ["updates", "values"]
+            async for mode, event in self.workflow.astream(initial_state, stream_mode=stream_mode): # type: ignore
+                if mode == "values":
+                    final_state = event
+                    continue
+
+                if mode == "messages":
+                    chunk, metadata = event
+                    if chunk.content:
+                        node_name = metadata.get('langgraph_node', '')
+                        yield {
+                            'node': node_name,
+                            'token': chunk.content,
+                            'phase': self._determine_phase(node_name)
+                        }
+                    continue
+
+                # Each update holds the single node that just finished
+                (node_name, node_state), = event.items()
+
+                yield {
+                    'node': node_name,
+                    'data': node_state,
+                    'phase': self._determine_phase(node_name)
+                }
+        except Exception as e:
+            self._fail_run(key, owner, e)
+            raise
+        except BaseException:
+            # Cancelled, or the consumer closed the stream early
+            self._abandon_run(key, owner)
+            raise
+        finally:
+            if pool_fill is not None:
+                await pool_fill
+
+        self._complete_run(key, owner, final_state)
+
+    def _replay_events(self, result: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Events for a finished run, one per node in workflow order, as astream() yields them."""
+        stats = result.get('processing_stats', {})
+        for node_name, keys in _NODE_OUTPUTS.items():
+            data = {key: result[key] for key in keys if key in result}
+            if node_name in stats and 'processing_stats' not in keys:
+                data['processing_stats'] = {node_name: stats[node_name]}
+            if data:
+                yield {
+                    'node': node_name,
+                    'data': copy.deepcopy(data),
+                    'phase': self._determine_phase(node_name)
+                }
 
-            yield {
-                'node': node_name,
-                'data': node_state,
-                'phase': self._determine_phase(node_name)
-            }
+    def stream(self, query: str, stream_tokens: bool = False) -> Iterator[Dict[str, Any]]:
+        """Synchronous wrapper around astream() for callers without an event loop."""
+        loop = new_event_loop()
+        events = self.astream(query, stream_tokens)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(events.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(events.aclose())
+            loop.close()
 
     def _determine_phase(self, node_name: str) -> str:
         """Determine which phase a node belongs to"""
+        return _NODE_PHASES.get(node_name, 'unknown')
 
-        if node_name in ['query_analyzer', 'search_orchestrator']:
-            return 'phase_0_analysis'
-        elif node_name in ['white_hat', 'red_hat', 'yellow_hat', 'black_hat']:
-            return 'phase_1_parallel'
-        elif node_name in ['aggregator', 'green_hat']:
-            return 'phase_2_sequential'
-        elif node_name == 'blue_hat':
-            return 'phase_3_synthesis'
-        else:
-            return 'unknown'
+    def clear_result_cache(self):
+        """Drop cached workflow results."""
+        self.result_cache.clear()
 
     def get_search_statistics(self) -> Dict:
         """Get search orchestration statistics"""
         return self.search_orchestrator.get_search_statistics()
+
+
+# Workflows shared across callers, keyed by (id(llm), search provider, max
+# searches). A cached workflow holds its LLM, so the id cannot be reused
+# while the entry exists.
+_WORKFLOWS = TTLCache(maxsize=32, ttl_seconds=3600)
+_workflows_lock = threading.Lock()
+
+
+def get_workflow(
+    llm: BaseLanguageModel,
+    search_api_provider: str = "tavily",
+    max_searches_per_query: int = 4
+) -> PhasedWorkflowGraph:
+    """
+    Get the shared workflow for an LLM and search provider, building it on first use.
+
+    Reusing the workflow keeps its search client, compiled graph and caches
+    across requests instead of rebuilding them per message.
+    """
+    key = (id(llm), search_api_provider, max_searches_per_query)
+    workflow = _WORKFLOWS.get(key)
+    if workflow is not None:
+        return workflow
+
+    with _workflows_lock:
+        workflow = _WORKFLOWS.get(key)
+        if workflow is None:
+            from services.search_apis import SearchAPIFactory
+
+            workflow = PhasedWorkflowGraph(
+                llm=llm,
+                search_api=SearchAPIFactory.create_provider(search_api_provider),
+                max_searches_per_query=max_searches_per_query
+            )
+            _WORKFLOWS.set(key, workflow)
+    return workflow
+
+
+if __name__ == "__main__":
+    # Nodes are not run while drawing, so no LLM or search client is needed
+    PhasedWorkflowGraph(llm=None, search_api=None).draw_graph() # type: ignore
@@ -2,8 +2,10 @@
 
 from .search_apis import SearchAPI, SearchResult, TavilySearchAPI, SearchAPIFactory
 from .phased_search_orchestrator import PhasedSearchOrchestrator, HatSearchContext, SearchCache, DuplicateDetector
+from .ttl_cache import TTLCache
 
 __all__ = [
     'SearchAPI', 'SearchResult', 'TavilySearchAPI', 'SearchAPIFactory',
-    'PhasedSearchOrchestrator', 'HatSearchContext', 'SearchCache', 'DuplicateDetector'
+    'PhasedSearchOrchestrator', 'HatSearchContext', 'SearchCache', 'DuplicateDetector',
+    'TTLCache'
 ]
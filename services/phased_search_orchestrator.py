@@ -14,15 +14,25 @@ Key features:
 - Distributes results to appropriate hats
 """
 
+import asyncio
 import time
 import hashlib
-from datetime import datetime, timedelta
+import re
 from enum import Enum
-from typing import Dict, List, Optional, TypedDict, Any, Tuple
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, TypedDict, Any, Tuple
 from dataclasses import dataclass, field
 from services.search_apis import TavilySearchAPI
 
 
+# Common important terms (simplified), in reporting order
+_THEME_KEYWORDS = (
+    'opportunity', 'risk', 'benefit', 'challenge', 'innovation',
+    'solution', 'strategy', 'advantage', 'problem', 'creative'
+)
+# Substring matches, as with `keyword in text`; no keyword contains another
+_THEME_RE = re.compile('|'.join(_THEME_KEYWORDS), re.IGNORECASE)
+
+
 class SearchCache:
     """Cache for storing search results to prevent duplicate queries."""
 
@@ -35,13 +45,13 @@ class SearchCache:
         combined = f"{hat_name}:{query.lower().strip()}"
         return hashlib.md5(combined.encode()).hexdigest()
 
-    def get(self, query: str, hat_name: str) -> Optional[List[Dict[str, Any]]]:
+    def get(self, query: str, hat_name: str) -> Optional[Sequence[Mapping[str, Any]]]:
         """Get cached results if available and not expired."""
         cache_key = self._generate_cache_key(query, hat_name)
 
         if cache_key in self.cache:
             result_data, timestamp = self.cache[cache_key]
-            if datetime.now() - timestamp < timedelta(seconds=self.ttl_seconds):
+            if time.monotonic() - timestamp < self.ttl_seconds:
                 return result_data
             else:
                 # Remove expired entry
@@ -49,10 +59,10 @@ class SearchCache:
 
         return None
 
-    def set(self, query: str, hat_name: str, results: List[Dict[str, Any]]):
+    def set(self, query: str, hat_name: str, results: Sequence[Mapping[str, Any]]):
         """Cache search results."""
         cache_key = self._generate_cache_key(query, hat_name)
-        self.cache[cache_key] = (results, datetime.now())
+        self.cache[cache_key] = (results, time.monotonic())
 
     def clear(self):
         """Clear all cached results."""
@@ -63,16 +73,16 @@ class SearchCache:
         total_entries = len(self.cache)
         valid_entries = 0
 
-        now = datetime.now()
+        now = time.monotonic()
         for result_data, timestamp in self.cache.values():
-            if now - timestamp < timedelta(seconds=self.ttl_seconds):
+            if now - timestamp < self.ttl_seconds:
                 valid_entries += 1
 
         return {
             "total_entries": total_entries,
             "valid_entries": valid_entries,
             "expired_entries": total_entries - valid_entries,
-            "hit_potential": valid_entries / max(total_entries, 1)
+            "hit_potential": valid_entries / total_entries if total_entries else 0.0
         }
 
 
@@ -124,18 +134,18 @@ class SearchPhase(Enum):
     BLUE = "blue"        # For Blue Hat (synthesis)
 
 
-@dataclass
+@dataclass(slots=True)
 class HatSearchContext:
     """Context for a specific hat's search"""
     hat_type: str
     search_query: str
-    search_results: List[Dict[str, Any]]
+    search_results: Sequence[Mapping[str, Any]]  # Tuple, shared by hats using the same search
     cache_hit: bool = False
     execution_time: float = 0.0
     metadata: Dict = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class PhasedSearchResult:
     """Result of phased search orchestration"""
     initial_searches: Dict[str, HatSearchContext]  # For White, Red, Yellow, Black
@@ -188,8 +198,61 @@ class PhasedSearchOrchestrator:
         Returns:
             Dict of hat_type -> HatSearchContext with search results
         """
+        results, pending = self._plan_search_wave(hat_search_queries)
+
+        # Execute the uncached searches; the workflow uses the async
+        # schedule_initial_search_wave() to overlap them instead
+        fetched = [self._timed_search(search_query) for _, search_query in pending]
+
+        return self._complete_search_wave(hat_search_queries, results, pending, fetched)
+
+    def schedule_initial_search_wave(
+        self,
+        hat_search_queries: Dict[str, str]
+    ) -> Dict[str, "asyncio.Future[HatSearchContext]"]:
+        """
+        Start the initial search wave on the running event loop without waiting for it.
+
+        Lets each hat await only its own search instead of the whole wave.
+
+        Returns:
+            Dict of hat_type -> future resolving to that hat's HatSearchContext;
+            cached results are already resolved
+        """
+        loop = asyncio.get_running_loop()
+        results, pending = self._plan_search_wave(hat_search_queries)
+
+        futures: Dict[str, asyncio.Future] = {}
+        for hat_type, context in results.items():
+            futures[hat_type] = loop.create_future()
+            futures[hat_type].set_result(context)
+        for hat_type, search_query in pending:
+            futures[hat_type] = asyncio.ensure_future(self._asearch_context(hat_type, search_query))
+
+        # Keep the callers' hat order regardless of which searches were cached
+        return {hat_type: futures[hat_type] for hat_type in hat_search_queries if hat_type in futures}
+
+    async def _asearch_context(self, hat_type: str, search_query: str) -> HatSearchContext:
+        """Run one planned search of a wave and build its context."""
+        search_results_dicts, execution_time = await self._atimed_search(search_query)
+        return self._wave_search_context(hat_type, search_query, search_results_dicts, execution_time)
+
+    def _plan_search_wave(
+        self,
+        hat_search_queries: Dict[str, str]
+    ) -> Tuple[Dict[str, HatSearchContext], List[Tuple[str, str]]]:
+        """
+        Apply budget, duplicate and cache checks to a search wave.
+
+        Returns:
+            Contexts served from the cache, and the (hat_type, search_query)
+            pairs that still need a search
+        """
         results = {}
+        pending: List[Tuple[str, str]] = []
         search_count = 0
+        cache_hits = 0
+        duplicates_prevented = 0
         registered_queries = self.duplicate_detector.get_registered_queries()
 
         for hat_type, search_query in hat_search_queries.items():
@@ -200,7 +263,7 @@ class PhasedSearchOrchestrator:
             # Check for duplicates
             is_duplicate, matched_query = self.duplicate_detector.is_duplicate(search_query, registered_queries)
             if is_duplicate:
-                self.search_stats['duplicates_prevented'] += 1
+                duplicates_prevented += 1
                 # Use cached results
                 cached_results = self.cache.get(search_query, hat_type)
                 if cached_results:
@@ -219,49 +282,87 @@ class PhasedSearchOrchestrator:
                 search_count += 1
                 continue
 
-            start_time = time.time()
-
             # Check cache
             cached_results = self.cache.get(search_query, hat_type)
-            cache_hit = cached_results is not None
 
-            if cache_hit:
-                search_results = cached_results
-                self.search_stats['cache_hits'] += 1
+            if cached_results is not None:
+                cache_hits += 1
+                results[hat_type] = HatSearchContext(
+                    hat_type=hat_type,
+                    search_query=search_query,
+                    search_results=cached_results,
+                    cache_hit=True,
+                    execution_time=0.0,
+                    metadata={
+                        'query_length': len(search_query),
+                        'result_count': len(cached_results)
+                    }
+                )
             else:
-                # Execute search (synchronously - search_api handles sync)
-                search_results = self.search_api.search(search_query, max_results=5)
-                # Convert SearchResult objects to dicts
-                search_results_dicts = [result.to_dict() if hasattr(result, 'to_dict') else result.__dict__ for result in search_results]
-                # Cache results
-                self.cache.set(search_query, hat_type, search_results_dicts)
+                # Register now so later hats in this wave see it as a duplicate
+                pending.append((hat_type, search_query))
                 self.duplicate_detector.add_query(search_query, hat_type)
                 registered_queries.append((search_query, hat_type))
 
-            execution_time = time.time() - start_time
+            search_count += 1
 
-            # Use cached results if available, otherwise use new results
-            final_results = search_results_dicts if not cache_hit else (cached_results or [])
+        # Update statistics once per wave
+        stats = self.search_stats
+        stats['total_searches'] += search_count
+        stats['total_queries'] += 1
+        stats['cache_hits'] += cache_hits
+        stats['duplicates_prevented'] += duplicates_prevented
 
-            results[hat_type] = HatSearchContext(
-                hat_type=hat_type,
-                search_query=search_query,
-                search_results=final_results,
-                cache_hit=cache_hit,
-                execution_time=execution_time,
-                metadata={
-                    'query_length': len(search_query),
-                    'result_count': len(final_results)
-                }
-            )
+        return results, pending
 
-            search_count += 1
+    def _complete_search_wave(
+        self,
+        hat_search_queries: Dict[str, str],
+        results: Dict[str, HatSearchContext],
+        pending: List[Tuple[str, str]],
+        fetched: Iterable[Tuple[Tuple[Dict[str, Any], ...], float]]
+    ) -> Dict[str, HatSearchContext]:
+        """Cache fetched search results and build the wave's contexts."""
+        for (hat_type, search_query), (search_results_dicts, execution_time) in zip(pending, fetched):
+            results[hat_type] = self._wave_search_context(hat_type, search_query, search_results_dicts, execution_time)
 
-        # Update statistics
-        self.search_stats['total_searches'] += search_count
-        self.search_stats['total_queries'] += 1
+        # Keep the callers' hat order regardless of which searches were cached
+        return {hat_type: results[hat_type] for hat_type in hat_search_queries if hat_type in results}
 
-        return results
+    def _wave_search_context(
+        self,
+        hat_type: str,
+        search_query: str,
+        search_results_dicts: Tuple[Dict[str, Any], ...],
+        execution_time: float
+    ) -> HatSearchContext:
+        """Cache one fetched wave search and build its context."""
+        # Cache results
+        self.cache.set(search_query, hat_type, search_results_dicts)
+
+        return HatSearchContext(
+            hat_type=hat_type,
+            search_query=search_query,
+            search_results=search_results_dicts,
+            cache_hit=False,
+            execution_time=execution_time,
+            metadata={
+                'query_length': len(search_query),
+                'result_count': len(search_results_dicts)
+            }
+        )
+
+    def _timed_search(self, search_query: str) -> Tuple[Tuple[Dict[str, Any], ...], float]:
+        """Run one search and return its results as dicts with the elapsed time."""
+        start_time = time.perf_counter()
+        search_results_dicts = tuple(self.search_api.search_dicts(search_query, max_results=5))
+        return search_results_dicts, time.perf_counter() - start_time
+
+    async def _atimed_search(self, search_query: str) -> Tuple[Tuple[Dict[str, Any], ...], float]:
+        """Async variant of _timed_search()."""
+        start_time = time.perf_counter()
+        search_results_dicts = tuple(await self.search_api.asearch_dicts(search_query, max_results=5))
+        return search_results_dicts, time.perf_counter() - start_time
 
     def execute_sequential_search(
         self,
@@ -282,57 +383,102 @@ class PhasedSearchOrchestrator:
         Returns:
             HatSearchContext if search executed, None otherwise
         """
+        needs_search, search_context = self._plan_sequential_search(hat_type, search_query, current_budget_used)
+        if not needs_search:
+            return search_context
+
+        search_results_dicts, execution_time = self._timed_search(search_query)
+        return self._complete_sequential_search(hat_type, search_query, search_results_dicts, execution_time)
+
+    async def aexecute_sequential_search(
+        self,
+        hat_type: str,
+        search_query: str,
+        current_budget_used: int,
+        context: Optional[Dict] = None
+    ) -> Optional[HatSearchContext]:
+        """Async variant of execute_sequential_search() that awaits the search on the event loop."""
+        needs_search, search_context = self._plan_sequential_search(hat_type, search_query, current_budget_used)
+        if not needs_search:
+            return search_context
+
+        search_results_dicts, execution_time = await self._atimed_search(search_query)
+        return self._complete_sequential_search(hat_type, search_query, search_results_dicts, execution_time)
+
+    def _plan_sequential_search(
+        self,
+        hat_type: str,
+        search_query: str,
+        current_budget_used: int
+    ) -> Tuple[bool, Optional[HatSearchContext]]:
+        """
+        Apply budget, duplicate and cache checks to a sequential search.
+
+        Returns:
+            (True, None) if the search should run, otherwise (False, context)
+            where context is the cached result or None if the search is skipped
+        """
         # Check if budget allows
         if current_budget_used >= self.max_searches:
-            return None
+            return False, None
 
         # Green Hat: May search if budget allows and complexity warrants it
         # Blue Hat: Rarely searches (synthesis focus)
         if hat_type == "blue":
-            return None
+            return False, None
 
         # Check for duplicates
         registered_queries = self.duplicate_detector.get_registered_queries()
         is_duplicate, matched_query = self.duplicate_detector.is_duplicate(search_query, registered_queries)
         if is_duplicate:
             self.search_stats['duplicates_prevented'] += 1
-            return None
-
-        start_time = time.time()
+            return False, None
 
         # Check cache
         cached_results = self.cache.get(search_query, hat_type)
-        cache_hit = cached_results is not None
-
-        if cache_hit:
-            search_results = cached_results
-            self.search_stats['cache_hits'] += 1
-        else:
-            # Execute search (synchronously)
-            search_results = self.search_api.search(search_query, max_results=5)
-            # Convert SearchResult objects to dicts
-            search_results_dicts = [result.to_dict() if hasattr(result, 'to_dict') else result.__dict__ for result in search_results]
-            # Cache results
-            self.cache.set(search_query, hat_type, search_results_dicts)
-            self.duplicate_detector.add_query(search_query, hat_type)
-
-        execution_time = time.time() - start_time
+        if cached_results is None:
+            return True, None
 
-        # Update statistics
+        self.search_stats['cache_hits'] += 1
         self.search_stats['total_searches'] += 1
 
-        # Use cached results if available, otherwise use new results
-        final_results = search_results_dicts if not cache_hit else (cached_results or [])
+        return False, HatSearchContext(
+            hat_type=hat_type,
+            search_query=search_query,
+            search_results=cached_results,
+            cache_hit=True,
+            execution_time=0.0,
+            metadata={
+                'query_length': len(search_query),
+                'result_count': len(cached_results),
+                'phase': 'sequential'
+            }
+        )
+
+    def _complete_sequential_search(
+        self,
+        hat_type: str,
+        search_query: str,
+        search_results_dicts: Tuple[Dict[str, Any], ...],
+        execution_time: float
+    ) -> HatSearchContext:
+        """Cache a sequential search's results and build its context."""
+        # Cache results
+        self.cache.set(search_query, hat_type, search_results_dicts)
+        self.duplicate_detector.add_query(search_query, hat_type)
+
+        # Update statistics
+        self.search_stats['total_searches'] += 1
 
         return HatSearchContext(
             hat_type=hat_type,
             search_query=search_query,
-            search_results=final_results,
-            cache_hit=cache_hit,
+            search_results=search_results_dicts,
+            cache_hit=False,
             execution_time=execution_time,
             metadata={
                 'query_length': len(search_query),
-                'result_count': len(final_results),
+                'result_count': len(search_results_dicts),
                 'phase': 'sequential'
             }
         )
@@ -438,15 +584,15 @@ class PhasedSearchOrchestrator:
         Returns:
             Dictionary with statistics
         """
-        cache_hit_rate = 0.0
-        if self.search_stats['total_searches'] > 0:
-            cache_hit_rate = (self.search_stats['cache_hits'] / self.search_stats['total_searches']) * 100
+        stats = self.search_stats
+        total_searches = stats['total_searches']
+        cache_hit_rate = stats['cache_hits'] * 100 / total_searches if total_searches else 0.0
 
         return {
-            'total_queries': self.search_stats['total_queries'],
-            'total_searches_executed': self.search_stats['total_searches'],
+            'total_queries': stats['total_queries'],
+            'total_searches_executed': total_searches,
             'cache_hit_rate_percent': round(cache_hit_rate, 2),
-            'duplicates_prevented': self.search_stats['duplicates_prevented'],
+            'duplicates_prevented': stats['duplicates_prevented'],
             'max_searches_per_query': self.max_searches,
             'cache_size': len(self.cache.cache),
             'duplicate_detector_size': len(self.duplicate_detector.query_registry)
@@ -455,20 +601,13 @@ class PhasedSearchOrchestrator:
     def _identify_key_themes(self, hat_responses: Dict[str, str]) -> List[str]:
         """Identify key themes across all hat responses"""
 
-        # Simple keyword extraction (can be enhanced with NLP)
-        all_text = ' '.join(hat_responses.values()).lower()
-
-        # Common important terms (simplified)
-        theme_keywords = [
-            'opportunity', 'risk', 'benefit', 'challenge', 'innovation',
-            'solution', 'strategy', 'advantage', 'problem', 'creative'
-        ]
-
-        themes = []
-        for keyword in theme_keywords:
-            if keyword in all_text:
-                themes.append(keyword)
+        # Simple keyword extraction (can be enhanced with NLP); one regex
+        # scan per response finds every theme present
+        found = set()
+        for response in hat_responses.values():
+            found.update(match.lower() for match in _THEME_RE.findall(response))
 
+        themes = [keyword for keyword in _THEME_KEYWORDS if keyword in found]
         return themes[:5]  # Top 5 themes
 
     def _identify_synthesis_opportunities(self, hat_responses: Dict[str, str]) -> List[str]:
@@ -4,13 +4,20 @@ Currently supports Tavily search API.
 """
 
 from typing import List, Dict, Any, Optional
-from tavily import TavilyClient
+from tavily import AsyncTavilyClient, TavilyClient
+import asyncio
+import logging
 import os
+import weakref
+
+logger = logging.getLogger(__name__)
 
 
 class SearchResult:
     """Represents a single search result."""
     
+    __slots__ = ("title", "url", "content", "score")
+    
     def __init__(self, title: str, url: str, content: str, score: float = 0.0):
         self.title = title
         self.url = url
@@ -33,6 +40,14 @@ class SearchAPI:
         """Perform a web search and return results."""
         raise NotImplementedError
 
+    def search_dicts(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Perform a web search and return results as plain dicts."""
+        return [result.to_dict() for result in self.search(query, max_results)]
+
+    async def asearch_dicts(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Async variant of search_dicts(); runs the blocking search on a worker thread."""
+        return await asyncio.to_thread(self.search_dicts, query, max_results)
+
 
 class TavilySearchAPI(SearchAPI):
     """Tavily search API implementation."""
@@ -41,33 +56,61 @@ class TavilySearchAPI(SearchAPI):
         api_key = os.getenv("TAVILY_API_KEY")
         if not api_key:
             raise ValueError("TAVILY_API_KEY environment variable is required")
+        self.api_key = api_key
         self.client = TavilyClient(api_key=api_key)
+        # Async clients pool connections bound to the loop that opened them,
+        # so each event loop gets its own
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncTavilyClient]" = weakref.WeakKeyDictionary()
 
     def search(self, query: str, max_results: int = 5) -> List[SearchResult]:
         """Perform a search using Tavily API."""
+        return [SearchResult(**result) for result in self.search_dicts(query, max_results)]
+
+    def search_dicts(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Perform a search using Tavily API, building result dicts directly."""
         try:
             response = self.client.search(
                 query=query,
                 max_results=max_results,
                 include_answer=False,
-                include_raw_content=True
+                include_raw_content=False
             )
-            
-            results = []
-            for item in response.get("results", []):
-                result = SearchResult(
-                    title=item.get("title", ""),
-                    url=item.get("url", ""),
-                    content=item.get("content", ""),
-                    score=item.get("score", 0.0)
-                )
-                results.append(result)
-            
-            return results
+            return self._result_dicts(response)
         except Exception as e:
-            print(f"Tavily search error: {e}")
+            logger.warning("Tavily search error: %s", e)
             return []
 
+    async def asearch_dicts(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Perform a search using Tavily's async client on the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = AsyncTavilyClient(api_key=self.api_key)
+
+        try:
+            response = await client.search(
+                query=query,
+                max_results=max_results,
+                include_answer=False,
+                include_raw_content=False
+            )
+            return self._result_dicts(response)
+        except Exception as e:
+            logger.warning("Tavily search error: %s", e)
+            return []
+
+    @staticmethod
+    def _result_dicts(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "title": item.get("title", ""),
+                "url": item.get("url", ""),
+                "content": item.get("content", ""),
+                "score": item.get("score", 0.0)
+            }
+            for item in response.get("results", [])
+        ]
+
 
 class SearchAPIFactory:
     """Factory class for creating search API instances."""
@@ -1,11 +1,18 @@
-import streamlit as st
 import asyncio
+import atexit
+import logging
+import queue
+import threading
+
+import streamlit as st
+import httpx
 import toml
 from langchain_openai import ChatOpenAI
 
 # Import phased workflow graph
-from graph.phased_workflow_graph import PhasedWorkflowGraph
-from services.search_apis import TavilySearchAPI
+from graph.phased_workflow_graph import get_workflow, new_event_loop
+
+logger = logging.getLogger(__name__)
 
 
 def load_secrets():
@@ -31,7 +38,7 @@ def load_secrets():
         return {}
 
 
-def get_llm():
+def create_llm():
     """Create and configure the LLM."""
     import os
 
@@ -55,10 +62,96 @@ def get_llm():
         api_key=secrets.get("OPENAI_API_KEY"),
         temperature=0,
         timeout=None,
+        streaming=True,
+        # A shared cache key routes every hat's calls to the same prompt cache,
+        # so repeated system prompts are reused once they are long enough to cache
+        model_kwargs={"prompt_cache_key": "six-thinking-hats"},
+        # One keep-alive pool for all six hats; connections are reused across messages
+        http_async_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16)
+        ),
     )
 
 
-async def generate_message_async(user_input, messages_container, llm):
+@st.cache_resource
+def get_event_loop():
+    """
+    Get the process-wide event loop, running on a background thread.
+
+    All sessions run their workflows here: the LLM's pooled async
+    connections are bound to the loop that opened them, so one loop lets
+    every session share them.
+    """
+    loop = new_event_loop()
+    threading.Thread(target=loop.run_forever, name="workflow-event-loop", daemon=True).start()
+    return loop
+
+
+@st.cache_resource
+def get_llm():
+    """Get the process-wide LLM, shared by all sessions and closed on shutdown."""
+    llm = create_llm()
+    atexit.register(close_llm, llm, get_event_loop())
+    return llm
+
+
+def close_llm(llm, loop):
+    """Close the LLM's shared HTTP client on its event loop, then stop the loop."""
+    try:
+        asyncio.run_coroutine_threadsafe(llm.http_async_client.aclose(), loop).result(timeout=5)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+
+
+def iter_workflow_events(workflow, user_input):
+    """
+    Run workflow.astream() on the shared event loop and yield its events here.
+
+    Streamlit calls must come from the session's own thread, so events are
+    handed over through a queue rather than rendered on the loop.
+    """
+    events = queue.Queue()
+    done = object()
+
+    async def pump():
+        try:
+            async for event in workflow.astream(user_input, stream_tokens=True):
+                events.put(event)
+        finally:
+            events.put(done)
+
+    future = asyncio.run_coroutine_threadsafe(pump(), get_event_loop())
+    try:
+        while (event := events.get()) is not done:
+            yield event
+        # Re-raise a workflow failure in the session
+        future.result()
+    finally:
+        future.cancel()
+
+
+# Workflow node -> (conversation key, title, avatar, phase) for hats shown as they finish
+HAT_DISPLAY = {
+    "white_hat": ("white", "White Hat (Facts)", "img/white.png", 1),
+    "red_hat": ("red", "Red Hat (Feelings)", "img/red.png", 1),
+    "yellow_hat": ("yellow", "Yellow Hat (Optimism)", "img/yellow.png", 1),
+    "black_hat": ("black", "Black Hat (Risks)", "img/black.png", 1),
+    "green_hat": ("green", "Green Hat (Creativity)", "img/green.png", 2),
+}
+
+
+def merge_state_update(results, update):
+    """Fold one node's state update into the accumulated results, as the graph's reducers do."""
+    for key, value in update.items():
+        if key == "processing_stats":
+            results[key] = {**results.get(key, {}), **value}
+        elif key in ("errors", "phase_completed"):
+            results[key] = results.get(key, []) + value
+        else:
+            results[key] = value
+
+
+def generate_message(user_input, messages_container, llm):
     """Generate message using phased workflow graph."""
 
     # Show processing state
@@ -67,20 +160,50 @@ async def generate_message_async(user_input, messages_container, llm):
         status.update(label="🔄 Initializing phased workflow...", state="running")
 
         try:
-            # Create search API
-            search_api = TavilySearchAPI()
-
-            # Create the phased workflow
-            workflow = PhasedWorkflowGraph(
-                llm=llm,
-                search_api=search_api,
-                max_searches_per_query=4
-            )
+            # Reuse the workflow (and its search client and caches) for this LLM
+            workflow = get_workflow(llm, search_api_provider="tavily", max_searches_per_query=4)
+
+            # Display user message
+            messages_container.chat_message("user", avatar="img/user.png").write(user_input)
 
-            # Execute the workflow
-            status.update(label="🔄 Executing phased workflow...", state="running")
+            # Execute the workflow, showing each hat as soon as it finishes and
+            # Blue Hat's synthesis token by token
+            status.update(label="📋 Phase 1: White, Red, Yellow, Black (Parallel)", state="running")
 
-            results = workflow.invoke(user_input)
+            results = {}
+            blue_placeholder = None
+            blue_tokens = []
+            for event in iter_workflow_events(workflow, user_input):
+                node = event["node"]
+                if "token" in event:
+                    if node == "blue_hat":
+                        if blue_placeholder is None:
+                            status.update(label="🔵 Phase 3: Blue Hat (Summary)", state="running")
+                            blue_placeholder = messages_container.chat_message("ai", avatar="img/blue.png").empty()
+                        blue_tokens.append(event["token"])
+                        blue_placeholder.markdown(f"**Blue Hat (Summary) (Phase 3):** \n{''.join(blue_tokens)}")
+                    continue
+
+                merge_state_update(results, event["data"] or {})
+
+                if node in HAT_DISPLAY:
+                    role, title, avatar, phase = HAT_DISPLAY[node]
+                    # Check if search was used for this hat
+                    hat_stats = results.get("processing_stats", {}).get(node)
+                    search_indicator = " 📱" if hat_stats and hat_stats.get("search_used") else ""
+                    messages_container.chat_message("ai", avatar=avatar).write(
+                        f"**{title}{search_indicator} (Phase {phase}):** \n{results.get(f'{role}_response', 'No response')}"
+                    )
+                elif node == "aggregator":
+                    status.update(label="🌱 Phase 2: Green Hat (Creative)", state="running")
+                elif node == "blue_hat":
+                    # Replace the streamed text with the final response (or show
+                    # it outright when a cached run was replayed without tokens)
+                    if blue_placeholder is None:
+                        blue_placeholder = messages_container.chat_message("ai", avatar="img/blue.png").empty()
+                    blue_placeholder.markdown(
+                        f"**Blue Hat (Summary) (Phase 3):** \n{results.get('blue_response', 'No response')}"
+                    )
 
             # Store the conversation
             current_conversation = {
@@ -97,62 +220,20 @@ async def generate_message_async(user_input, messages_container, llm):
             }
 
             st.session_state.conversation.append(current_conversation)
-
-            # Display user message
-            messages_container.chat_message("user", avatar="img/user.png").write(user_input)
-
-            # Display team responses with phase indicators
-            status.update(label="💬 Displaying team responses...", state="running")
-
-            # Phase 1: Parallel hats
-            status.update(label="📋 Phase 1: White, Red, Yellow, Black (Parallel)", state="running")
-
-            parallel_roles = [
-                ("white", "White Hat (Facts)", "img/white.png"),
-                ("red", "Red Hat (Feelings)", "img/red.png"),
-                ("yellow", "Yellow Hat (Optimism)", "img/yellow.png"),
-                ("black", "Black Hat (Risks)", "img/black.png"),
-            ]
-
-            for role, title, avatar in parallel_roles:
-                response_text = current_conversation[role]
-                # Check if search was used for this hat
-                search_used = current_conversation.get("statistics", {}).get(role, {}).get("search_used", False)
-                search_indicator = " 📱" if search_used else ""
-
-                messages_container.chat_message("ai", avatar=avatar).write(
-                    f"**{title}{search_indicator} (Phase 1):** \n{response_text}"
-                )
-
-            # Phase 2: Green Hat
-            status.update(label="🌱 Phase 2: Green Hat (Creative)", state="running")
-            green_response = current_conversation["green"]
-            green_search_used = current_conversation.get("statistics", {}).get("green_hat", {}).get("search_used", False)
-            green_indicator = " 📱" if green_search_used else ""
-            messages_container.chat_message("ai", avatar="img/green.png").write(
-                f"**Green Hat (Creativity){green_indicator} (Phase 2):** \n{green_response}"
+            stats = current_conversation["statistics"]
+
+            # Display processing statistics
+            overall = stats.get("overall") or {}
+            messages_container.chat_message("ai", avatar="📊").write(
+                f"**Processing Statistics:**\n"
+                f"- Phases completed: {', '.join(overall.get('phases_completed', []))}\n"
+                f"- Total execution time: {overall.get('total_execution_time', 0):.2f}s\n"
+                f"- Errors encountered: {overall.get('total_errors', 0)}\n"
+                f"- Processing mode: {current_conversation['processing_mode']}"
             )
 
-            # Phase 3: Blue Hat
-            status.update(label="🔵 Phase 3: Blue Hat (Summary)", state="running")
-            summary_response = current_conversation["summary"]
-            messages_container.chat_message("ai", avatar="img/blue.png").write(
-                f"**Blue Hat (Summary) (Phase 3):** \n{summary_response}"
-            )
-
-            # Display processing statistics if available
-            if "statistics" in current_conversation:
-                stats = current_conversation["statistics"]
-                messages_container.chat_message("ai", avatar="📊").write(
-                    f"**Processing Statistics:**\n"
-                    f"- Phases completed: {', '.join(stats.get('overall', {}).get('phases_completed', []))}\n"
-                    f"- Total execution time: {stats.get('overall', {}).get('total_execution_time', 0):.2f}s\n"
-                    f"- Errors encountered: {stats.get('overall', {}).get('total_errors', 0)}\n"
-                    f"- Processing mode: {current_conversation.get('processing_mode', 'N/A')}"
-                )
-
             # Display any errors
-            errors = current_conversation.get("errors", [])
+            errors = current_conversation["errors"]
             if errors:
                 error_msg = "\n".join(errors)
                 messages_container.chat_message("ai", avatar="⚠️").write(
@@ -174,11 +255,6 @@ async def generate_message_async(user_input, messages_container, llm):
             )
 
 
-def generate_message(user_input, messages_container, llm):
-    """Wrapper to call async function from Streamlit."""
-    asyncio.run(generate_message_async(user_input, messages_container, llm))
-
-
 def main():
     # Define constants
     height = 1000
@@ -227,6 +303,14 @@ def main():
     # Chatbot UI
     if prompt := st.chat_input("Enter your question...", key="prompt"):
         generate_message(prompt, messages, llm)
+    else:
+        # The input box is already on screen; build the shared workflow (search
+        # client, compiled graph) while the user types instead of on the first message
+        try:
+            get_workflow(llm, search_api_provider="tavily", max_searches_per_query=4)
+        except Exception:
+            # Shown to the user with the first message, which retries the build
+            logger.exception("Workflow warmup failed")
 
 
 if __name__ == "__main__":
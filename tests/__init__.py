@@ -0,0 +1 @@
+"""Tests for the Six Thinking Hats workflow."""
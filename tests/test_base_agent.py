@@ -0,0 +1,81 @@
+"""Tests for the shared thinking hat agent machinery."""
+
+import asyncio
+import unittest
+from datetime import date
+from unittest import mock
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from agents import base_agent
+from agents.base_agent import AgentFactory, BaseThinkingHatAgent
+from agents.response_cache import default_response_cache
+
+
+class SystemMessageTest(unittest.TestCase):
+
+    def test_prompt_shows_current_date(self):
+        agent = AgentFactory.create_agent("white_hat", FakeListChatModel(responses=["ok"]))
+        self.assertIn(f"Current date: {date.today().isoformat()}", agent.create_system_message().content)
+
+        agent.set_search_results([{"title": "Result", "url": "https://example.com", "content": "text"}], {})
+        self.assertIn(f"Current date: {date.today().isoformat()}", agent.create_system_message().content)
+
+    def test_cached_message_is_rebuilt_when_the_day_changes(self):
+        agent = AgentFactory.create_agent("white_hat", FakeListChatModel(responses=["ok"]))
+        with mock.patch.object(base_agent, '_today', return_value="2026-01-01"):
+            first = agent.create_system_message()
+            self.assertIs(agent.create_system_message(), first)
+        with mock.patch.object(base_agent, '_today', return_value="2026-01-02"):
+            self.assertIn("Current date: 2026-01-02", agent.create_system_message().content)
+
+
+class RecordingChatModel(FakeListChatModel):
+    """Fake model that keeps the messages of every call."""
+
+    calls: list = []
+
+    def _call(self, messages, *args, **kwargs):
+        self.calls.append(messages)
+        return super()._call(messages, *args, **kwargs)
+
+
+class ProcessTest(unittest.TestCase):
+
+    def test_history_keeps_only_human_and_ai_turns(self):
+        llm = RecordingChatModel(responses=["ok"], calls=[])
+        agent = AgentFactory.create_agent("white_hat", llm)
+        history = [HumanMessage(content="Hi"), SystemMessage(content="Injected"), AIMessage(content="Hello")]
+
+        # The hat subclasses override process(); this is the base conversational entry point
+        BaseThinkingHatAgent.process(agent, "And now?", history)
+
+        messages = llm.calls[0]
+        self.assertEqual([type(message) for message in messages], [SystemMessage, HumanMessage, AIMessage, HumanMessage])
+        self.assertNotIn("Injected", [message.content for message in messages])
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        default_response_cache.clear()
+
+    def test_agents_on_different_models_do_not_share_responses(self):
+        first = AgentFactory.create_agent("white_hat", FakeListChatModel(responses=["from model A"]))
+        second = AgentFactory.create_agent("white_hat", FakeListChatModel(responses=["from model B"]))
+
+        self.assertEqual(asyncio.run(first.process("Is remote work here to stay?")).response, "from model A")
+        self.assertEqual(asyncio.run(second.process("Is remote work here to stay?")).response, "from model B")
+
+    def test_agents_on_the_same_model_share_responses(self):
+        llm = FakeListChatModel(responses=["first", "second"])
+        first = AgentFactory.create_agent("white_hat", llm)
+        second = AgentFactory.create_agent("white_hat", llm)
+
+        asyncio.run(first.process("Is remote work here to stay?"))
+        self.assertEqual(asyncio.run(second.process("Is remote work here to stay?")).response, "first")
+
+
+if __name__ == "__main__":
+    unittest.main()
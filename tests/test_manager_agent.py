@@ -0,0 +1,96 @@
+"""Tests for the manager agent's rule-based query analysis."""
+
+import re
+import unittest
+from unittest import mock
+
+from agents import manager_agent
+from agents.manager_agent import Complexity, ManagerAgent, Topic
+
+# Queries and the topic the original per-keyword substring classifier gave them
+BASELINE_TOPICS = [
+    ("Is air pollution getting worse in big cities?", Topic.GENERAL),
+    ("What financial aid options exist for college students?", Topic.GENERAL),
+    ("How does mental health affect family relationships?", Topic.EMOTIONAL),
+    ("Should I invest in a fintech startup?", Topic.BUSINESS),
+    ("Is there a flaw in the new tax law?", Topic.SOCIAL),
+    ("Why do outlaws become folk heroes?", Topic.SOCIAL),
+    ("How do I feel less anxious before a job interview?", Topic.EMOTIONAL),
+    ("What are the health benefits of daily exercise?", Topic.HEALTH),
+    ("Is cloud computing secure for hospital data?", Topic.TECHNOLOGY),
+    ("How can our company increase revenue and profit this year?", Topic.BUSINESS),
+    ("What is the impact of social media on teenagers' self-esteem?", Topic.SOCIAL),
+    ("What are the safety risks of home solar batteries?", Topic.SAFETY),
+    ("How should governments regulate cryptocurrency markets?", Topic.BUSINESS),
+    ("What's the best way to learn programming as an adult?", Topic.TECHNOLOGY),
+    ("How do I tell my friend I am sad about our friendship?", Topic.EMOTIONAL),
+    ("Will robotics replace warehouse jobs in the community?", Topic.TECHNOLOGY),
+    ("Should I take the new drug my doctor suggested for my symptoms?", Topic.HEALTH),
+    ("What is the history of the Roman empire?", Topic.GENERAL),
+    ("How can a small business use digital marketing strategy?", Topic.BUSINESS),
+    ("Is it worth buying insurance against accident and injury liability?", Topic.SAFETY),
+    ("Is AI overhyped?", Topic.GENERAL),
+    ("What ROI can I expect?", Topic.GENERAL),
+    ("Is the air cleaner after rain?", Topic.GENERAL),
+]
+
+
+def baseline_complexity(query):
+    """The original complexity scoring, regexes compiled on every call."""
+    score = 0
+    if len(query.split()) > 15:
+        score += 1
+    if re.search(r'\b(algorithm|quantum|crypto|blockchain|AI|ML|neural|bioinformatics|pharmacology)\b', query.lower()):
+        score += 2
+    if query.count('?') > 1 or query.count(' and ') > 0 or query.count(',') > 2:
+        score += 1
+    if re.search(r'\b(compare|versus|difference|trade-off|pros/cons|advantage|disadvantage)\b', query.lower()):
+        score += 1
+    if score <= 1:
+        return Complexity.SIMPLE
+    return Complexity.MODERATE if score <= 3 else Complexity.COMPLEX
+
+
+class ClassifyTopicTest(unittest.TestCase):
+
+    def classify(self, query):
+        return ManagerAgent(None)._classify_topic(query.lower())
+
+    def test_matches_baseline_classifier(self):
+        for query, topic in BASELINE_TOPICS:
+            with self.subTest(query=query):
+                self.assertEqual(self.classify(query), topic)
+
+    def test_matches_baseline_classifier_without_automaton(self):
+        with mock.patch.object(manager_agent, '_TOPIC_AUTOMATON', None):
+            for query, topic in BASELINE_TOPICS:
+                with self.subTest(query=query):
+                    self.assertEqual(self.classify(query), topic)
+
+
+
+class DetermineComplexityTest(unittest.TestCase):
+
+    def test_matches_baseline_scoring(self):
+        queries = [query for query, _ in BASELINE_TOPICS] + [
+            "Compare quantum computing versus classical ML for AI workloads?",
+            "What is the difference between a neural network and an algorithm, and why?",
+        ]
+        agent = ManagerAgent(None)
+        for query in queries:
+            with self.subTest(query=query):
+                self.assertEqual(agent._determine_complexity(query, query.lower()), baseline_complexity(query))
+
+
+class AllocateSearchBudgetTest(unittest.TestCase):
+
+    def test_each_allocated_hat_gets_its_own_query(self):
+        analysis = ManagerAgent(None).analyze_query(
+            "What are the risks and benefits of starting an AI company, and how do customers feel?"
+        )
+        self.assertLessEqual(len(analysis.budget_allocation), 4)
+        self.assertEqual(set(analysis.search_queries_as_dict()), set(analysis.budget_allocation))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+"""Tests for the phased workflow graph, run with fake LLM and search providers."""
+
+import asyncio
+import gc
+import threading
+import time
+import unittest
+import weakref
+from unittest import mock
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from agents.response_cache import default_response_cache
+from graph.phased_workflow_graph import PhasedWorkflowGraph
+from services.search_apis import SearchAPI, SearchResult
+
+QUERY = "What are the risks and benefits of starting an AI company, and how do customers feel?"
+
+
+class FakeSearchAPI(SearchAPI):
+    """Returns fixed results for any query."""
+
+    def search(self, query, max_results=5):
+        return [SearchResult(f"Result for {query[:20]}", "https://example.com", "content " * 20, 0.5)]
+
+
+class SlowSearchAPI(FakeSearchAPI):
+    """Takes a moment per search, so a run stays in flight long enough to join."""
+
+    def search(self, query, max_results=5):
+        time.sleep(0.05)
+        return super().search(query, max_results)
+
+
+class EmptySearchAPI(SearchAPI):
+    """Finds nothing for any query."""
+
+    def search(self, query, max_results=5):
+        return []
+
+
+class FailingSearchAPI(SearchAPI):
+    """Raises on every search, like a provider that is down."""
+
+    def search(self, query, max_results=5):
+        raise RuntimeError("search provider unavailable")
+
+
+class PhasedWorkflowGraphTest(unittest.TestCase):
+
+    def setUp(self):
+        default_response_cache.clear()
+        self.llm = FakeListChatModel(responses=[f"response {i}" for i in range(20)])
+
+    def test_all_hats_respond(self):
+        graph = PhasedWorkflowGraph(llm=self.llm, search_api=FakeSearchAPI())
+        result = graph.invoke(QUERY)
+
+        self.assertEqual(result['errors'], [])
+        for hat in ('white', 'red', 'yellow', 'black', 'green', 'blue'):
+            self.assertTrue(result[f'{hat}_response'].startswith("response"), hat)
+        self.assertIn('search_orchestration', result['phase_completed'])
+
+    def test_failed_search_reported_once_and_hats_answer_without_it(self):
+        graph = PhasedWorkflowGraph(llm=self.llm, search_api=FailingSearchAPI())
+        result = graph.invoke(QUERY)
+
+        self.assertEqual(len(result['errors']), 1)
+        self.assertTrue(result['errors'][0].startswith("Search orchestration failed"))
+        for hat in ('white', 'red', 'yellow', 'black'):
+            self.assertTrue(result[f'{hat}_response'].startswith("response"), hat)
+            self.assertFalse(result['processing_stats'][f'{hat}_hat']['search_used'], hat)
+
+    def test_search_used_reflects_results_in_prompt(self):
+        result = PhasedWorkflowGraph(llm=self.llm, search_api=FakeSearchAPI()).invoke(QUERY)
+        self.assertTrue(result['processing_stats']['white_hat']['search_used'])
+
+        default_response_cache.clear()
+        result = PhasedWorkflowGraph(llm=self.llm, search_api=EmptySearchAPI()).invoke(QUERY)
+        for hat in ('white', 'red', 'yellow', 'black', 'green'):
+            self.assertFalse(result['processing_stats'][f'{hat}_hat']['search_used'], hat)
+
+    def test_stream_repeats_replay_the_cached_run(self):
+        graph = PhasedWorkflowGraph(llm=self.llm, search_api=FakeSearchAPI())
+        with mock.patch.object(graph.manager_agent, 'analyze_query', wraps=graph.manager_agent.analyze_query) as analyze:
+            first = list(graph.stream(QUERY))
+            repeat = list(graph.stream(QUERY))
+            result = graph.invoke(QUERY)
+
+        self.assertEqual(analyze.call_count, 1)
+        self.assertEqual([event['node'] for event in repeat][-1], 'blue_hat')
+        streamed = {event['node']: event['data'] for event in first}
+        replayed = {event['node']: event['data'] for event in repeat}
+        for hat in ('white', 'red', 'yellow', 'black', 'green', 'blue'):
+            self.assertEqual(replayed[f'{hat}_hat'][f'{hat}_response'], streamed[f'{hat}_hat'][f'{hat}_response'], hat)
+            self.assertEqual(result[f'{hat}_response'], streamed[f'{hat}_hat'][f'{hat}_response'], hat)
+        self.assertEqual(
+            replayed['white_hat']['processing_stats'],
+            streamed['white_hat']['processing_stats']
+        )
+
+    def test_concurrent_stream_and_invoke_share_one_run(self):
+        graph = PhasedWorkflowGraph(llm=self.llm, search_api=FakeSearchAPI())
+
+        async def collect():
+            return [event async for event in graph.astream(QUERY)]
+
+        async def both():
+            return await asyncio.gather(collect(), graph.ainvoke(QUERY))
+
+        with mock.patch.object(graph.manager_agent, 'analyze_query', wraps=graph.manager_agent.analyze_query) as analyze:
+            events, result = asyncio.run(both())
+
+        self.assertEqual(analyze.call_count, 1)
+        blue = [event for event in events if event['node'] == 'blue_hat'][-1]
+        self.assertEqual(blue['data']['blue_response'], result['blue_response'])
+
+    def test_stream_closed_early_hands_the_run_to_a_joined_caller(self):
+        graph = PhasedWorkflowGraph(llm=self.llm, search_api=SlowSearchAPI())
+
+        async def close_after_first_event_while_joined():
+            events = graph.astream(QUERY)
+            await events.__anext__()
+            joined = asyncio.ensure_future(graph.ainvoke(QUERY))
+            await asyncio.sleep(0.01)
+            await events.aclose()
+            return await joined
+
+        result = asyncio.run(close_after_first_event_while_joined())
+        self.assertEqual(result['errors'], [])
+        self.assertTrue(result['blue_response'].startswith("response"))
+
+    def test_cancelled_owner_does_not_cancel_joined_callers(self):
+        graph = PhasedWorkflowGraph(llm=self.llm, search_api=SlowSearchAPI())
+
+        async def cancel_owner_while_joined():
+            owner = asyncio.ensure_future(graph.ainvoke(QUERY))
+            await asyncio.sleep(0.01)
+            joined = asyncio.ensure_future(graph.ainvoke(QUERY))
+            await asyncio.sleep(0.01)
+            owner.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await owner
+            return await joined
+
+        result = asyncio.run(cancel_owner_while_joined())
+        self.assertEqual(result['errors'], [])
+        self.assertTrue(result['blue_response'].startswith("response"))
+
+    def test_sync_calls_from_several_threads_share_one_graph(self):
+        graph = PhasedWorkflowGraph(llm=self.llm, search_api=SlowSearchAPI(), max_concurrent_llm_calls=1)
+        results, failures = [], []
+
+        def ask(i):
+            try:
+                results.append(graph.invoke(f"{QUERY} Case {i}."))
+            except Exception as e:
+                failures.append(e)
+
+        threads = [threading.Thread(target=ask, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(failures, [])
+        self.assertEqual([result['errors'] for result in results], [[]] * 4)
+
+    def test_each_event_loop_gets_its_own_llm_slot(self):
+        graph = PhasedWorkflowGraph(llm=self.llm, search_api=FakeSearchAPI())
+
+        async def slots():
+            return graph._llm_slot(), graph._llm_slot()
+
+        first, again = asyncio.run(slots())
+        other, _ = asyncio.run(slots())
+        self.assertIs(first, again)
+        self.assertIsNot(first, other)
+
+    def test_cached_results_are_isolated_from_callers(self):
+        graph = PhasedWorkflowGraph(llm=self.llm, search_api=FakeSearchAPI())
+        first = graph.invoke(QUERY)
+        self.assertNotIn('search_wave', first)
+
+        first['processing_stats']['white_hat']['search_used'] = 'mutated'
+        first['phase_completed'].append('mutated')
+        repeat = graph.invoke(QUERY)
+
+        self.assertNotEqual(repeat['processing_stats']['white_hat']['search_used'], 'mutated')
+        self.assertNotIn('mutated', repeat['phase_completed'])
+        self.assertNotIn('search_wave', repeat)
+
+    def test_pooled_agents_do_not_outlive_graph(self):
+        graph = PhasedWorkflowGraph(llm=self.llm, search_api=FakeSearchAPI())
+        graph.invoke(QUERY)
+        llm_ref = weakref.ref(self.llm)
+
+        del graph, self.llm
+        gc.collect()
+        self.assertIsNone(llm_ref())
+
+
+if __name__ == "__main__":
+    unittest.main()